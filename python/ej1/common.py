@@ -10,3 +10,10 @@ COLORES = {
     "Verlet": "green",
     "Gear predictor Corrector": "orange",
 }
+
+# Integrador de engine.single equivalente a cada archivo de salida
+INTEGRADORES = {
+    "Gear predictor Corrector": "Gear5",
+    "Euler-Predictor-Corrector Modified": "Beeman",
+    "Verlet": "Verlet",
+}
@@ -3,7 +3,8 @@ import sys
 
 import matplotlib.pyplot as plt
 
-from utils.utils import load_data, mce, read_config, save_plot, validate_simulation_dir
+from utils.metrics import stream_errors
+from utils.utils import read_config, save_plot, validate_simulation_dir
 
 from .common import ARCHIVOS, COLORES
 
@@ -18,12 +19,17 @@ def main():
         sys.exit(1)
 
     nombres_metodos = list(ARCHIVOS.keys())
-    ecms = []
 
-    for nombre, archivo in ARCHIVOS.items():
-        _, data = load_data(os.path.join(sim_dir, archivo))
-        ecm = mce(data[:, 0], data[:, 2])
-        ecms.append(ecm)
+    # Error cuadrático medio de los tres integradores, leyendo los archivos a la par
+    paths = [os.path.join(sim_dir, archivo) for archivo in ARCHIVOS.values()]
+    try:
+        acumuladores = stream_errors(paths)
+
+    except Exception as e:
+        print(f"Error loading data files in {sim_dir}: {e}")
+        sys.exit(1)
+
+    ecms = [acumuladores[path].mse for path in paths]
 
     fig, ax = plt.subplots(figsize=(12, 6))
     for i, ecm in enumerate(ecms):
@@ -4,12 +4,16 @@ import sys
 import matplotlib.pyplot as plt
 import numpy as np
 
-from utils.utils import load_data, mce, read_config, save_plot
+from utils.catalog import expand_run_args
+from utils.metrics import stream_errors
+from utils.sweep import pop_workers_arg, run_sweep
+from utils.utils import read_config, save_plot
 
 from .common import ARCHIVOS
 
 
-def get_mce(sim_dir, errores_por_metodo):
+def get_mce(sim_dir):
+    """Get dt and the MCE of every integrator for a single oscillator simulation directory."""
     config = read_config(sim_dir)
     dt = config["simulation"]["dt"]
 
@@ -18,33 +22,35 @@ def get_mce(sim_dir, errores_por_metodo):
         print(f"Error: Directory '{sim_dir}' is not a single oscillator simulation")
         return None, None
 
-    for nombre, archivo in ARCHIVOS.items():
-        path_archivo = os.path.join(sim_dir, archivo)
-        t, data = load_data(path_archivo)
+    # Calculamos el error cuadrático medio de los tres integradores en una sola pasada
+    paths = {nombre: os.path.join(sim_dir, archivo) for nombre, archivo in ARCHIVOS.items()}
+    try:
+        acumuladores = stream_errors(list(paths.values()))
 
-        if t is None or data is None:
-            return None, None
-
-        # Calcular el error cuadrático medio
-        errores_por_metodo[nombre].append(mce(data[:, 0], data[:, 2]))
+    except Exception as e:
+        print(f"Error loading data files in {sim_dir}: {e}")
+        return None, None
 
-    return dt
+    errores = {nombre: acumuladores[path].mse for nombre, path in paths.items()}
+    return dt, errores
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python ej1C.py <simulation_directory1> [simulation_directory2 ...]")
+    workers, args = pop_workers_arg(sys.argv[1:])
+    sim_dirs = expand_run_args(args)
+    if len(sim_dirs) < 1:
+        print("Usage: python ej1C.py <simulation_directory1> [simulation_directory2 ...] [--workers=N]")
         sys.exit(1)
 
-    sim_dirs = sys.argv[1:]
-
     errores_por_metodo = {nombre: [] for nombre in ARCHIVOS.keys()}
     dts = []
 
-    for sim_dir in sim_dirs:
-        dt = get_mce(sim_dir, errores_por_metodo)
+    # Procesamos los directorios en paralelo
+    for dt, errores in run_sweep(get_mce, sim_dirs, workers, default=(None, None)):
         if dt is not None:
             dts.append(dt)
+            for nombre, ecm in errores.items():
+                errores_por_metodo[nombre].append(ecm)
 
     if not dts:
         print("Error: No valid simulation directories found")
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from engine.single import DEFAULT_T_MAX, INTEGRATORS, SingleOscillator, energy_vs_dt
+from utils.utils import save_plot
+
+from .common import COLORES, INTEGRADORES
+
+
+def main():
+    # Sin argumentos barremos dt de 1e-6 a 1e-2
+    try:
+        dts = np.array([float(dt) for dt in sys.argv[1:]]) if len(sys.argv) > 1 else np.logspace(-6, -2, 9)
+
+    except ValueError:
+        print("Usage: python energia_vs_dt.py [dt1 dt2 ...]")
+        sys.exit(1)
+
+    dts = np.sort(dts)
+    osc = SingleOscillator()
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for nombre, integrador in INTEGRADORES.items():
+        # Deriva máxima de K + U + disipada respecto de la energía inicial
+        deriva = energy_vs_dt(osc, INTEGRATORS[integrador](), dts, DEFAULT_T_MAX)
+        ax.plot(dts, deriva, marker="o", label=nombre, color=COLORES[nombre])
+
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Paso de integración dt [s]")
+    ax.set_ylabel("Error relativo máximo del balance de energía")
+    ax.legend(loc="lower right")
+    ax.grid(True, which="both", linestyle="--", linewidth=0.7)
+
+    plot_path = os.path.join("plots", "energia_vs_dt.png")
+    save_plot(fig, plot_path)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
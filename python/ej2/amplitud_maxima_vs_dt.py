@@ -3,37 +3,47 @@ import sys
 
 import matplotlib.pyplot as plt
 import numpy as np
-from utils.utils import read_config, save_plot
+
+from utils.catalog import expand_run_args
+from utils.sweep import pop_workers_arg, run_sweep
+from utils.utils import load_max_amplitudes, read_config, save_plot
+
+
+def get_max_amplitude(sim_dir):
+    """Get dt and the maximum amplitude reached in a coupled simulation directory."""
+    if not os.path.exists(sim_dir):
+        print(f"Warning: Directory {sim_dir} does not exist, skipping...")
+        return None, None
+
+    config = read_config(sim_dir)
+    if config["oscillatorType"] != "coupled":
+        print(f"Warning: {sim_dir} is not a coupled oscillator simulation, skipping...")
+        return None, None
+
+    dt = config["simulation"]["dt"]
+    _, amplitudes = load_max_amplitudes(sim_dir)
+    if amplitudes is None:
+        print(f"Warning: Could not load valid data from {sim_dir}, skipping...")
+        return None, None
+
+    return dt, np.max(amplitudes)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python get_max_amplitudes.py <sim_dir1> [sim_dir2 ...]")
+    workers, args = pop_workers_arg(sys.argv[1:])
+    sim_dirs = expand_run_args(args)
+    if len(sim_dirs) < 1:
+        print("Usage: python get_max_amplitudes.py <sim_dir1> [sim_dir2 ...] [--workers=N]")
         sys.exit(1)
 
-    # Get simulation directories from command line arguments
-    sim_dirs = sys.argv[1:]
-
     # Collect dt and max amplitude data
     dt_values = []
     max_amplitudes = []
 
-    for sim_dir in sim_dirs:
-        if not os.path.exists(sim_dir):
-            print(f"Warning: Directory {sim_dir} does not exist, skipping...")
-            continue
-
-        config = read_config(sim_dir)
-        if config["oscillatorType"] != "coupled":
-            print(f"Warning: {sim_dir} is not a coupled oscillator simulation, skipping...")
+    for dt, max_amplitude in run_sweep(get_max_amplitude, sim_dirs, workers, default=(None, None)):
+        if dt is None:
             continue
 
-        dt = config["simulation"]["dt"]
-        max_amplitudes_file = os.path.join(sim_dir, "max_amplitudes.txt")
-
-        data = np.loadtxt(max_amplitudes_file)
-        max_amplitude = np.max(data[:, 1])
-
         if dt == 1e-4:
             print("sexo")
             max_amplitudes.extend([max_amplitude, max_amplitude, max_amplitude])
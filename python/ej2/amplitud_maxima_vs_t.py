@@ -2,9 +2,9 @@ import os
 import sys
 
 import matplotlib.pyplot as plt
-import numpy as np
 
-from utils.utils import load_data, read_config, save_plot, validate_simulation_dir
+from utils.pyramid import plot_downsampled
+from utils.utils import load_max_amplitudes, read_config, save_plot, validate_simulation_dir
 
 
 def main():
@@ -16,31 +16,15 @@ def main():
         print("Error: This script is for coupled oscillator simulations")
         sys.exit(1)
 
-    # Chequeamos si ya se había creado el archivo de máximas amplitudes
-    max_amplitudes_file = os.path.join(sim_dir, "max_amplitudes.txt")
-    if os.path.exists(max_amplitudes_file):
-        data = np.loadtxt(max_amplitudes_file)
-        t = data[:, 0]
-        max_amplitudes = data[:, 1]
+    # Máxima amplitud absoluta para cada instante de tiempo, de las reducciones o de output.txt
+    t, max_amplitudes = load_max_amplitudes(sim_dir)
 
-    # Sino buscamos por archivo de simulación y lo calculamos
-    else:
-        sim_file = "output.txt"
-        data_file = os.path.join(sim_dir, sim_file)
-        t, positions = load_data(data_file)
-
-        if t is None or positions is None:
-            print("Error: Could not load valid data from the file")
-            sys.exit(1)
-
-        # Calculamos la máxima amplitud absoluta para cada instante de tiempo
-        max_amplitudes = np.max(np.abs(positions), axis=1)
-
-        # Guardamos las amplitudes máximas junto con el tiempo
-        np.savetxt(max_amplitudes_file, np.column_stack((t, max_amplitudes)))
+    if t is None or max_amplitudes is None:
+        print("Error: Could not load valid data from the file")
+        sys.exit(1)
 
     fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(t, max_amplitudes, "b-", linewidth=2)
+    plot_downsampled(ax, t, max_amplitudes, "b-", linewidth=2)
 
     ax.set_xlabel("Tiempo [s]")
     ax.set_ylabel("Amplitud máxima absoluta |y| [m]")
@@ -2,9 +2,11 @@ import os
 import sys
 
 import matplotlib.pyplot as plt
-import numpy as np
 
-from utils.utils import load_data, read_config, save_plot
+from utils.catalog import expand_run_args
+from utils.pyramid import plot_downsampled
+from utils.sweep import pop_workers_arg, run_sweep
+from utils.utils import load_max_amplitudes, read_config, save_plot
 
 
 def get_max_amplitudes(sim_dir):
@@ -20,43 +22,26 @@ def get_max_amplitudes(sim_dir):
     k = config["parameters"]["k"]
     omega = config["parameters"]["omega"]
 
-    # Chequeamos si ya se había creado el archivo de máximas amplitudes
-    max_amplitudes_file = os.path.join(sim_dir, "max_amplitudes.txt")
-    if os.path.exists(max_amplitudes_file):
-        data = np.loadtxt(max_amplitudes_file)
-        t = data[:, 0]
-        max_amplitudes = data[:, 1]
+    # Máxima amplitud absoluta para cada instante de tiempo, de las reducciones o de output.txt
+    t, max_amplitudes = load_max_amplitudes(sim_dir)
 
-    # Sino buscamos por archivo de simulación y lo calculamos
-    else:
-        sim_file = "output.txt"
-        data_file = os.path.join(sim_dir, sim_file)
-        t, positions = load_data(data_file)
-
-        if t is None or positions is None:
-            print(f"Error: Could not load valid data from {sim_dir}")
-            return None, None, None, None
-
-        # Calculamos la máxima amplitud absoluta para cada instante de tiempo
-        max_amplitudes = np.max(np.abs(positions), axis=1)
-
-        # Guardamos las amplitudes máximas junto con el tiempo
-        np.savetxt(max_amplitudes_file, np.column_stack((t, max_amplitudes)))
+    if t is None or max_amplitudes is None:
+        print(f"Error: Could not load valid data from {sim_dir}")
+        return None, None, None, None
 
     return t, max_amplitudes, k, omega
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python amplitud_maxima_vs_t_multiple.py <sim_dir1> [sim_dir2 sim_dir3 ...]")
+    workers, args = pop_workers_arg(sys.argv[1:])
+    sim_dirs = expand_run_args(args)
+    if len(sim_dirs) < 1:
+        print("Usage: python amplitud_maxima_vs_t_multiple.py <sim_dir1> [sim_dir2 sim_dir3 ...] [--workers=N]")
         sys.exit(1)
 
-    sim_dirs = sys.argv[1:]
-
-    # Recolectar datos de todas las simulaciones
+    # Recolectar datos de todas las simulaciones, en paralelo
     data = []
-    for sim_dir in sim_dirs:
-        result = get_max_amplitudes(sim_dir)
+    for result in run_sweep(get_max_amplitudes, sim_dirs, workers, default=(None, None, None, None)):
         if result[0] is not None:  # Si los datos son válidos
             data.append(result)
 
@@ -72,7 +57,7 @@ def main():
 
     for i, (t, max_amplitudes, k, omega) in enumerate(data):
         label = f"k = {k:.1f}, ω = {omega:.2f}"
-        ax.plot(t, max_amplitudes, linewidth=2, label=label, alpha=0.8)
+        plot_downsampled(ax, t, max_amplitudes, linewidth=2, label=label, alpha=0.8)
 
     ax.set_xlabel("Tiempo [s]")
     ax.set_ylabel("Amplitud máxima absoluta |y| [m]")
@@ -90,4 +75,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
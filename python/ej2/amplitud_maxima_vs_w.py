@@ -1,10 +1,14 @@
 import os
 import sys
+from functools import partial
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-from utils.utils import load_data, read_config, save_plot
+from engine.frequency_response import steady_state_amplitudes
+from utils.catalog import expand_run_args
+from utils.sweep import pop_workers_arg, run_sweep
+from utils.utils import load_max_amplitudes, read_config, save_plot
 
 
 def get_stationary_amplitude(sim_dir, stationary_time):
@@ -16,27 +20,16 @@ def get_stationary_amplitude(sim_dir, stationary_time):
         print(f"Error: Simulation in {sim_dir} is not a coupled oscillator simulation")
         return None, None
 
-    # Chequeamos si ya se había creado el archivo de máximas amplitudes
-    max_amplitudes_file = os.path.join(sim_dir, "max_amplitudes.txt")
-    if os.path.exists(max_amplitudes_file):
-        data = np.loadtxt(max_amplitudes_file)
-        t = data[:, 0]
-        max_amplitudes = data[:, 1]
+    # Si la simulación se cortó al detectar el estado estacionario ya trae su amplitud
+    steady_state = config.get("steadyState")
+    if steady_state is not None:
+        return steady_state["amplitude"], omega
 
-    # Sino buscamos por archivo de simulación y lo calculamos
-    else:
-        sim_file = "output.txt"
-        data_file = os.path.join(sim_dir, sim_file)
-        t, positions = load_data(data_file)
+    # Máxima amplitud absoluta para cada instante de tiempo, de las reducciones o de output.txt
+    t, max_amplitudes = load_max_amplitudes(sim_dir)
 
-        if t is None or positions is None:
-            return None, None
-
-        # Calculamos la máxima amplitud absoluta para cada instante de tiempo
-        max_amplitudes = np.max(np.abs(positions), axis=1)
-
-        # Guardamos las amplitudes máximas junto con el tiempo
-        np.savetxt(max_amplitudes_file, np.column_stack((t, max_amplitudes)))
+    if t is None or max_amplitudes is None:
+        return None, None
 
     # Descartamos los tiempos que no son estacionarios
     stationary_indices = np.where(t >= stationary_time)[0]
@@ -51,27 +44,31 @@ def get_stationary_amplitude(sim_dir, stationary_time):
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python compare_stationary_amplitudes.py <stationary_time> <sim_dir1> [sim_dir2 sim_dir3 ...]")
+    workers, args = pop_workers_arg(sys.argv[1:])
+    if len(args) < 2:
+        print("Usage: python compare_stationary_amplitudes.py <stationary_time> <sim_dir1> [sim_dir2 sim_dir3 ...] [--workers=N]")
         sys.exit(1)
 
     try:
-        stationary_time = float(sys.argv[1])
+        stationary_time = float(args[0])
 
     except ValueError:
         print("Error: Stationary time must be a number")
         sys.exit(1)
 
-    sim_dirs = sys.argv[2:]
+    sim_dirs = expand_run_args(args[1:])
 
     amplitudes = []
     omegas = []
 
-    for sim_dir in sim_dirs:
-        amp, omega = get_stationary_amplitude(sim_dir, stationary_time)
+    # Procesamos los directorios en paralelo
+    results = run_sweep(partial(get_stationary_amplitude, stationary_time=stationary_time), sim_dirs, workers, default=(None, None))
+    reference_dir = None
+    for sim_dir, (amp, omega) in zip(sim_dirs, results):
         if amp is not None and omega is not None:
             amplitudes.append(amp)
             omegas.append(omega)
+            reference_dir = reference_dir or sim_dir
             print(f"Amplitude: {amp}, Omega: {omega}")
 
     if not amplitudes:
@@ -94,6 +91,14 @@ def main():
     # Marcar el punto máximo en rojo
     ax.plot(max_omega, max_amplitude, "ro", markersize=10, label=f"Máximo (ω={max_omega:.2f})")
 
+    # Respuesta en frecuencia exacta del estado estacionario como referencia
+    parameters = read_config(reference_dir)["parameters"]
+    omegas_ref = np.linspace(omegas[0], omegas[-1], 2000)
+    amplitudes_ref = steady_state_amplitudes(
+        omegas_ref, n=parameters["N"], m=parameters["m"], k=parameters["k"], gamma=parameters["gamma"], a=parameters["A"]
+    )
+    ax.plot(omegas_ref, amplitudes_ref, "k--", linewidth=1, label="Respuesta en frecuencia")
+
     ax.set_xlabel("ω [rad/s]")
     ax.set_ylabel("Amplitud máxima absoluta |y| [m]")
     ax.grid(True, linestyle="--", alpha=0.7)
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from engine.ensemble import stationary_amplitudes
+from utils.utils import save_plot
+
+
+def main():
+    if len(sys.argv) != 6:
+        print("Usage: python amplitud_maxima_vs_w_ensamble.py <stationary_time> <k> <w_min> <w_max> <n_omegas>")
+        sys.exit(1)
+
+    try:
+        stationary_time = float(sys.argv[1])
+        k = float(sys.argv[2])
+        w_min = float(sys.argv[3])
+        w_max = float(sys.argv[4])
+        n_omegas = int(sys.argv[5])
+
+    except ValueError:
+        print("Error: All arguments must be numbers")
+        sys.exit(1)
+
+    # Simulamos todas las frecuencias juntas, sin escribir trayectorias
+    omegas = np.linspace(w_min, w_max, n_omegas)
+    amplitudes = stationary_amplitudes(omegas, k, stationary_time)
+
+    for omega, amp in zip(omegas, amplitudes):
+        print(f"Amplitude: {amp}, Omega: {omega}")
+
+    # Encontrar el punto máximo
+    max_idx = np.argmax(amplitudes)
+    max_omega = omegas[max_idx]
+    max_amplitude = amplitudes[max_idx]
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(omegas, amplitudes, "bo-", linewidth=2, markersize=8, label="Amplitud vs ω")
+
+    # Marcar el punto máximo en rojo
+    ax.plot(max_omega, max_amplitude, "ro", markersize=10, label=f"Máximo (ω={max_omega:.2f})")
+
+    ax.set_xlabel("ω [rad/s]")
+    ax.set_ylabel("Amplitud máxima absoluta |y| [m]")
+    ax.grid(True, linestyle="--", alpha=0.7)
+    ax.legend()
+
+    plot_path = os.path.join("plots", f"amplitud_maxima_vs_w_ensamble_k{k:g}.png")
+    save_plot(fig, plot_path)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
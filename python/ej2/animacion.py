@@ -1,47 +1,75 @@
+import contextlib
 import os
+import shutil
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
 
-from utils.utils import load_data, read_config, validate_simulation_dir
+from utils.cache import load_cached
+from utils.sweep import pop_workers_arg
+from utils.utils import compute_position_stats, iter_data, load_reductions, read_config, validate_simulation_dir
 
+# Parámetros del video
+FPS = 50
+DPI = 100
+FIGSIZE = (12, 6)
 
-def main():
-    sim_dir = validate_simulation_dir()
-    config = read_config(sim_dir)
+# Frames que rasteriza cada proceso por tarea
+FRAMES_PER_TASK = 20
 
-    # La simulación tiene que ser de osciladores acoplados
-    if config["oscillatorType"] != "coupled":
-        print("Error: This script is for coupled oscillator simulations")
-        sys.exit(1)
 
-    sim_file = "output.txt"
-    data_file = os.path.join(sim_dir, sim_file)
-    t, positions = load_data(data_file)
-
-    if t is None or positions is None:
+def load_frames(data_file, config):
+    """Positions of the rows to animate and the min/max position over the whole run."""
+    n_rows, y_min, y_max = compute_position_stats(data_file)
+    if n_rows is None:
         print("Error: Could not load valid data from the file")
         sys.exit(1)
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    # Calculamos la duración total de la simulación
+    total_time = config["simulation"]["tMax"]
+    dt = config["simulation"]["dt"]
+    total_frames = int(total_time / dt)
+    frames = min(total_frames, 1000)  # Máximo 1000 frames
+    frame_indices = np.linspace(0, n_rows - 1, frames, dtype=int)
+
+    # Con el caché binario vamos directo a las filas que se animan
+    data = load_cached(data_file)
+    if data is not None:
+        return np.array(data[frame_indices, 1:]), y_min, y_max
 
-    # Posiciones en el eje x de 0 a n-1
-    n = positions.shape[1]
-    x_positions = np.arange(n)
+    # Sino recorremos el texto por bloques quedándonos solo con esas filas
+    positions = None
+    row = 0
+    for t, block in iter_data(data_file, use_cache=False):
+        if positions is None:
+            positions = np.empty((len(frame_indices), block.shape[1]))
+        selected = (frame_indices >= row) & (frame_indices < row + len(t))
+        positions[selected] = block[frame_indices[selected] - row]
+        row += len(t)
 
-    (line,) = ax.plot([], [], "c-", lw=2)  # Ondita
-    (points,) = ax.plot([], [], "ro", markersize=4, alpha=0.2)  # Partículas
+    return positions, y_min, y_max
 
-    ax.set_xlim(-1, n)
-    y_min = np.min(positions)
-    y_max = np.max(positions)
 
-    if np.isnan(y_min) or np.isnan(y_max) or np.isinf(y_min) or np.isinf(y_max):
-        print("Error: Invalid position values in data")
-        sys.exit(1)
+# Figura de cada proceso de rasterizado, armada una sola vez por init_renderer
+_renderer = None
+
 
+def init_renderer(x_positions, y_min, y_max):
+    """Build the figure of a worker and cache its static background for blitting."""
+    global _renderer
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIGSIZE, dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    (line,) = ax.plot([], [], "c-", lw=2, animated=True)  # Ondita
+    (points,) = ax.plot([], [], "ro", markersize=4, alpha=0.2, animated=True)  # Partículas
+
+    ax.set_xlim(x_positions[0] - 1, x_positions[-1] + 1)
     margin = (y_max - y_min) * 0.1
     if margin < 1e-10:
         margin = 0.1
@@ -51,27 +79,99 @@ def main():
     ax.set_ylabel("Posición [m]")
     ax.grid(True, linestyle="--", alpha=0.7)
 
-    def init():
-        line.set_data([], [])
-        points.set_data([], [])
-        return line, points
+    # Dibujamos una sola vez lo estático y lo guardamos como fondo
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    _renderer = (canvas, ax, line, points, background, x_positions)
+
+
+def render_frames(frames):
+    """Rasterize frames to raw RGB bytes, redrawing only the wave over the cached background."""
+    canvas, ax, line, points, background, x_positions = _renderer
 
-    def animate(frame):
-        y_values = positions[frame]
+    rendered = []
+    for y_values in frames:
+        canvas.restore_region(background)
         line.set_data(x_positions, y_values)
         points.set_data(x_positions, y_values)
-        return line, points
+        ax.draw_artist(line)
+        ax.draw_artist(points)
+        rendered.append(np.asarray(canvas.buffer_rgba())[..., :3].tobytes())
+
+    return rendered
+
+
+def save_animation(positions, x_positions, y_min, y_max, animation_path, workers):
+    """Render frames in parallel and stream them in order as raw video into ffmpeg."""
+    width, height = int(FIGSIZE[0] * DPI), int(FIGSIZE[1] * DPI)
+    # fmt: off
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(FPS), "-i", "-",
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", "-vcodec", "libx264", "-preset", "ultrafast",
+        animation_path,
+    ]
+    # fmt: on
+
+    chunks = [positions[i : i + FRAMES_PER_TASK] for i in range(0, len(positions), FRAMES_PER_TASK)]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as encoder:
+        initargs = (x_positions, y_min, y_max)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_renderer, initargs=initargs) as pool:
+                try:
+                    for rendered in pool.map(render_frames, chunks):
+                        for frame in rendered:
+                            encoder.stdin.write(frame)
+                except BrokenPipeError:
+                    # Sin encoder no tiene sentido rasterizar el resto de los frames
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+            encoder.stdin.close()
+        except BrokenPipeError:
+            # ffmpeg terminó antes de tiempo (codec inválido, disco lleno); lo informa su código de salida
+            with contextlib.suppress(BrokenPipeError):
+                encoder.stdin.close()
+
+    if encoder.returncode != 0:
+        print(f"Error: ffmpeg failed to encode the animation (exit code {encoder.returncode})")
+        sys.exit(1)
 
-    # Calculamos la duración total de la simulación
-    total_time = config["simulation"]["tMax"]
-    dt = config["simulation"]["dt"]
-    total_frames = int(total_time / dt)
-    frames = min(total_frames, 1000)  # Máximo 1000 frames
-    frame_indices = np.linspace(0, len(t) - 1, frames, dtype=int)
 
-    anim = FuncAnimation(fig, animate, init_func=init, frames=frame_indices, interval=20)
+def main():
+    workers, args = pop_workers_arg(sys.argv[1:])
+    sim_dir = validate_simulation_dir(args)
+    config = read_config(sim_dir)
+
+    # La simulación tiene que ser de osciladores acoplados
+    if config["oscillatorType"] != "coupled":
+        print("Error: This script is for coupled oscillator simulations")
+        sys.exit(1)
+
+    if shutil.which("ffmpeg") is None:
+        print("Error: ffmpeg is required to save the animation")
+        sys.exit(1)
+
+    # Si la corrida se hizo con engine.main ya tiene los frames reducidos
+    reductions = load_reductions(sim_dir, ["frames", "frames_y_range"])
+    if reductions is not None:
+        positions = reductions["frames"]
+        y_min, y_max = reductions["frames_y_range"]
+        x_positions = np.arange(positions.shape[1])
+    else:
+        sim_file = "output.txt"
+        data_file = os.path.join(sim_dir, sim_file)
+        positions, y_min, y_max = load_frames(data_file, config)
+
+        # Si se guardó solo un subconjunto de partículas las ubicamos en su índice real
+        particles = config.get("output", {}).get("particles")
+        x_positions = np.array(particles) if particles else np.arange(positions.shape[1])
+
+    if np.isnan(y_min) or np.isnan(y_max) or np.isinf(y_min) or np.isinf(y_max):
+        print("Error: Invalid position values in data")
+        sys.exit(1)
+
     animation_path = os.path.join(sim_dir, "animation.mp4")
-    anim.save(animation_path, writer="ffmpeg", fps=50, dpi=100)
+    save_animation(positions, x_positions, y_min, y_max, animation_path, workers)
     print(f"Animation saved to {animation_path}")
 
 
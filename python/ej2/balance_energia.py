@@ -0,0 +1,66 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from utils.pyramid import plot_downsampled
+from utils.utils import load_data, load_reductions, read_config, save_plot, validate_simulation_dir
+
+
+def load_energy(sim_dir):
+    """(t, kinetic, potential, dissipated, work) from the reductions of engine.main or from energy.txt."""
+    reductions = load_reductions(sim_dir, ["energy_t", "kinetic", "potential", "dissipated", "work"])
+    if reductions is not None:
+        return tuple(reductions[key] for key in ("energy_t", "kinetic", "potential", "dissipated", "work"))
+
+    # Archivo escrito por la simulación en Java con ENERGY=true
+    t, values = load_data(os.path.join(sim_dir, "energy.txt"))
+    if t is None or values.shape[1] != 4:
+        return None
+    return (t,) + tuple(values[:, i] for i in range(4))
+
+
+def main():
+    sim_dir = validate_simulation_dir()
+    config = read_config(sim_dir)
+
+    # La simulación tiene que ser de osciladores acoplados
+    if config["oscillatorType"] != "coupled":
+        print("Error: This script is for coupled oscillator simulations")
+        sys.exit(1)
+
+    energy = load_energy(sim_dir)
+    if energy is None:
+        print("Error: The run has no energy data (run it with ENERGY=true or with engine.main)")
+        sys.exit(1)
+
+    t, kinetic, potential, dissipated, work = energy
+    total = kinetic + potential
+
+    # Lo que no cierra del balance: E(t) - E(0) = W(t) - D(t) salvo el error de integración
+    residual = total - total[0] - work + dissipated
+    max_residual = np.max(np.abs(residual))
+    scale = max(np.max(np.abs(work)), np.max(total), np.finfo(float).tiny)
+    print(f"Max |E - E0 - W + D|: {max_residual:.6e} J ({max_residual / scale:.3e} relative to the max energy or work)")
+
+    fig, (ax_energy, ax_residual) = plt.subplots(2, 1, figsize=(12, 9), sharex=True)
+    plot_downsampled(ax_energy, t, total, "b-", linewidth=1.5, label="Energía mecánica E = K + U")
+    plot_downsampled(ax_energy, t, work, "g-", linewidth=1.5, label="Trabajo del forzado W")
+    plot_downsampled(ax_energy, t, dissipated, "r-", linewidth=1.5, label="Energía disipada D")
+    ax_energy.set_ylabel("Energía [J]")
+    ax_energy.legend(loc="upper left")
+    ax_energy.grid(True, linestyle="--", alpha=0.7)
+
+    plot_downsampled(ax_residual, t, residual, "k-", linewidth=1)
+    ax_residual.set_xlabel("Tiempo [s]")
+    ax_residual.set_ylabel("E - E(0) - W + D [J]")
+    ax_residual.grid(True, linestyle="--", alpha=0.7)
+
+    plot_path = os.path.join(sim_dir, "balance_energia.png")
+    save_plot(fig, plot_path)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
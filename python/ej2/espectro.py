@@ -0,0 +1,93 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm
+
+from engine.coupled import DEFAULT_M
+from engine.frequency_response import normal_mode_frequencies
+from utils.catalog import expand_run_args
+from utils.spectral import DEFAULT_SEGMENT, compute_spectra, dispersion_relation, dominant_frequencies
+from utils.utils import read_config, save_plot
+
+
+def main():
+    args = expand_run_args(sys.argv[1:])
+    if len(args) not in (1, 2, 3):
+        print("Usage: python espectro.py <sim_dir> [stationary_time] [segment]")
+        sys.exit(1)
+
+    sim_dir = args[0]
+    if not os.path.exists(sim_dir):
+        print(f"Directory '{sim_dir}' does not exist")
+        sys.exit(1)
+
+    try:
+        stationary_time = float(args[1]) if len(args) > 1 else None
+        segment = int(args[2]) if len(args) > 2 else DEFAULT_SEGMENT
+    except ValueError:
+        print("Error: Stationary time and segment must be numbers")
+        sys.exit(1)
+
+    config = read_config(sim_dir)
+
+    # La simulación tiene que ser de osciladores acoplados
+    if config["oscillatorType"] != "coupled":
+        print("Error: This script is for coupled oscillator simulations")
+        sys.exit(1)
+
+    data_file = os.path.join(sim_dir, "output.txt")
+    omegas, particle_psd, mode_psd, n_segments = compute_spectra(data_file, segment=segment, stationary_time=stationary_time)
+    if omegas is None:
+        print("Error: Could not load valid data from the file")
+        sys.exit(1)
+
+    parameters = config["parameters"]
+    drive = parameters["omega"]
+    k = parameters["k"]
+    m = parameters.get("m", DEFAULT_M)
+
+    # Picos del espectro promediado sobre todas las partículas
+    mean_psd = particle_psd.mean(axis=1)
+    peak_omegas, peak_powers = dominant_frequencies(omegas, mean_psd)
+    print(f"Segments averaged: {n_segments}, resolution: {omegas[1]:.4g} rad/s")
+    for omega, power in zip(peak_omegas, peak_powers):
+        print(f"Peak: ω = {omega:.6g} rad/s, PSD = {power:.3e}")
+
+    # Relación de dispersión medida contra los modos normales de la cadena
+    modes, measured = dispersion_relation(omegas, mode_psd)
+    particles = config.get("output", {}).get("particles")
+    omega_limit = min(omegas[-1], 1.2 * max(2 * np.sqrt(k / m), drive))
+    fig, (ax_psd, ax_modes) = plt.subplots(1, 2, figsize=(16, 6))
+
+    ax_psd.semilogy(omegas, mean_psd, "b-", linewidth=1.5)
+    ax_psd.plot(peak_omegas, peak_powers, "ro", markersize=6)
+    ax_psd.axvline(drive, color="gray", linestyle="--", label=f"ω forzado = {drive:g} rad/s")
+    ax_psd.set_xlim(0, omega_limit)
+    ax_psd.set_xlabel("ω [rad/s]")
+    ax_psd.set_ylabel("Densidad espectral media [m²·s/rad]")
+    ax_psd.grid(True, linestyle="--", alpha=0.7)
+    ax_psd.legend()
+
+    positive = mode_psd[mode_psd > 0]
+    norm = LogNorm(vmin=max(positive.max() * 1e-10, positive.min()), vmax=positive.max()) if positive.size else None
+    mesh = ax_modes.pcolormesh(modes, omegas, np.maximum(mode_psd, norm.vmin if norm else 0), norm=norm, shading="nearest", cmap="viridis")
+    fig.colorbar(mesh, ax=ax_modes, label="Densidad espectral [m²·s/rad]")
+    ax_modes.plot(modes, measured, "ro", markersize=4, label="Pico medido")
+
+    # Los modos normales solo corresponden a la cadena completa, no a un subconjunto de partículas
+    if not particles or len(particles) == parameters["N"]:
+        ax_modes.plot(modes, normal_mode_frequencies(len(modes), m, k), "w-", linewidth=1.5, label="Teórico")
+    ax_modes.set_xlabel("Modo q")
+    ax_modes.set_ylabel("ω [rad/s]")
+    ax_modes.set_ylim(0, omega_limit)
+    ax_modes.legend()
+
+    plot_path = os.path.join(sim_dir, "espectro.png")
+    save_plot(fig, plot_path)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
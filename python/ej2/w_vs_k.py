@@ -1,9 +1,12 @@
 import os
+import sys
 
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.optimize import curve_fit
 
+from engine.frequency_response import resonance_frequency
+from engine.resonance import DEFAULT_BRACKET, find_resonances
 from utils.utils import read_config, save_plot
 
 
@@ -14,6 +17,26 @@ def extract_w0_k(sim_dir):
     return w0, k
 
 
+def pop_bracket_arg(args):
+    """Remove a --bracket=LOW,HIGH option from args, returning (bracket, remaining_args)."""
+    bracket = DEFAULT_BRACKET
+    remaining = []
+    for arg in args:
+        if arg.startswith("--bracket="):
+            try:
+                low, high = (float(value) for value in arg.split("=", 1)[1].split(","))
+            except ValueError:
+                print(f"Invalid value for bracket: {arg}")
+                sys.exit(1)
+            if not 0 < low < 1 < high:
+                print("Error: The bracket must satisfy 0 < LOW < 1 < HIGH")
+                sys.exit(1)
+            bracket = (low, high)
+        else:
+            remaining.append(arg)
+    return bracket, remaining
+
+
 def main():
     # if len(sys.argv) < 2:
     #     print("Usage: python w0_vs_k.py <sim_dir1> [sim_dir2 sim_dir3 ...]")
@@ -31,8 +54,26 @@ def main():
     # w0s = np.array(w0s)
     # ks = np.array(ks)
 
-    ks = np.array([102.3, 500, 1000, 5000, 8000, 10000])
-    w0s = np.array([1.94, 4.78, 6.8, 15.3, 19.35, 21.6])
+    # Con argumentos buscamos ω₀ para cada k; sin ninguno usamos los valores medidos a mano
+    bracket, args = pop_bracket_arg(sys.argv[1:])
+    if len(args) == 1:
+        print("Usage: python w_vs_k.py [stationary_time k1 [k2 ...] [--bracket=LOW,HIGH]]")
+        sys.exit(1)
+
+    if len(args) > 1:
+        try:
+            stationary_time = float(args[0])
+            ks = np.array([float(k) for k in args[1:]])
+
+        except ValueError:
+            print("Error: Stationary time and k values must be numbers")
+            sys.exit(1)
+
+        w0s, _ = find_resonances(ks, stationary_time, bracket)
+
+    else:
+        ks = np.array([102.3, 500, 1000, 5000, 8000, 10000])
+        w0s = np.array([1.94, 4.78, 6.8, 15.3, 19.35, 21.6])
 
     # Fit: w0 = C * sqrt(k)
     def fit_func(k, c):
@@ -50,6 +91,12 @@ def main():
     k_fit = np.linspace(0, ks.max() * 1.05, 200)
     ax.plot(k_fit, fit_func(k_fit, c_fit), "r--", label=f"Ajuste: ω₀ = {c_fit:.3f}·√k")
     ax.plot(ks, w0s, "o", label="ω₀ simulada")
+
+    # ω₀ de la respuesta en frecuencia exacta, buscada cerca de cada valor simulado
+    w0s_ref = np.array([resonance_frequency(0.8 * w0, 1.2 * w0, k=k)[0] for k, w0 in zip(ks, w0s)])
+    for k, w0, w0_ref in zip(ks, w0s, w0s_ref):
+        print(f"k = {k}: ω₀ simulada = {w0:.4f}, ω₀ respuesta en frecuencia = {w0_ref:.4f}")
+    ax.plot(ks, w0s_ref, "x", label="ω₀ respuesta en frecuencia")
     ax.set_xlabel("k [kg/s²]")
     ax.set_ylabel("ω₀ [rad/s]")
     ax.legend()
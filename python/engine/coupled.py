@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+
+from engine.reducers import Trajectory
+from utils import profiling
+
+# Mismos valores por defecto que Config.COUPLED_* en Java
+DEFAULT_N = 1000
+DEFAULT_M = 0.00021
+DEFAULT_K = 102.3
+DEFAULT_GAMMA = 0.0003
+DEFAULT_A = 0.01
+DEFAULT_DT = 1e-4
+DEFAULT_T_MAX = 20.0
+DEFAULT_OMEGA = 2.0 * math.pi
+
+
+class CoupledOscillator:
+    """NumPy port of coupled.Oscillator: a fixed-end chain driven by A*sin(wt) at particle 0.
+
+    Forces are evaluated with slice operations on preallocated buffers, in the same
+    floating point order as the Java loop.
+    """
+
+    def __init__(self, n=DEFAULT_N, m=DEFAULT_M, k=DEFAULT_K, gamma=DEFAULT_GAMMA, a=DEFAULT_A, omega=DEFAULT_OMEGA):
+        self.n = n
+        self.m = m
+        self.k = k
+        self.gamma = gamma
+        self.a = a
+        self.omega = omega
+        self.positions = np.zeros(n)
+        self.velocities = np.zeros(n)
+        self.accelerations = np.zeros(n)
+
+        # Buffers auxiliares para no reservar memoria en cada paso
+        self._left = np.zeros(n)
+        self._right = np.zeros(n)
+
+    def initialize(self):
+        # Inicialmente todas las partículas están en reposo en su posición de equilibrio
+        self.positions.fill(0.0)
+        self.velocities.fill(0.0)
+        self.compute_accelerations(0.0)
+
+    def compute_accelerations(self, t):
+        y = self.positions
+        left = self._left
+        right = self._right
+        acc = self.accelerations
+
+        # yi - yi-1, con la partícula 0 unida al forzado A*sin(wt)
+        left[0] = y[0] - self.a * math.sin(self.omega * t)
+        np.subtract(y[1:], y[:-1], out=left[1:])
+
+        # yi - yi+1, con la última partícula unida a la pared fija
+        np.subtract(y[:-1], y[1:], out=right[:-1])
+        right[-1] = y[-1] - 0.0
+
+        # Fi = -k(yi-yi-1) - k(yi-yi+1) - γvi
+        np.multiply(left, -self.k, out=acc)
+        np.multiply(right, self.k, out=right)
+        np.subtract(acc, right, out=acc)
+        np.multiply(self.velocities, self.gamma, out=right)
+        np.subtract(acc, right, out=acc)
+        np.divide(acc, self.m, out=acc)
+
+
+class VerletIntegrator:
+    """NumPy port of coupled.integrators.VerletIntegrator, swapping buffers instead of cloning.
+
+    Works on any oscillator exposing positions/velocities/accelerations arrays of the same shape.
+    """
+
+    def initialize(self, osc, dt):
+        self._prev = osc.positions - osc.velocities * dt + 0.5 * osc.accelerations * dt * dt
+        self._next = np.empty_like(osc.positions)
+        self._tmp = np.empty_like(osc.positions)
+
+    def step(self, osc, t, dt):
+        x = osc.positions
+        new = self._next
+        tmp = self._tmp
+
+        # x(t+dt) = 2x(t) - x(t-dt) + a(t)dt²
+        np.multiply(x, 2.0, out=new)
+        np.subtract(new, self._prev, out=new)
+        np.multiply(osc.accelerations, dt, out=tmp)
+        np.multiply(tmp, dt, out=tmp)
+        np.add(new, tmp, out=new)
+
+        # Velocidad por diferencia central
+        np.subtract(new, self._prev, out=osc.velocities)
+        np.divide(osc.velocities, 2 * dt, out=osc.velocities)
+
+        # Rotamos los buffers: la posición actual pasa a ser la anterior
+        self._prev, osc.positions, self._next = x, new, self._prev
+        osc.compute_accelerations(t + dt)
+
+
+def count_steps(dt, t_max):
+    """Number of rows Simulation.run writes, reproducing its floating point time accumulation."""
+    steps = 0
+    t = 0.0
+    while t <= t_max:
+        steps += 1
+        t += dt
+    return steps
+
+
+@profiling.profiled("integrate")
+def integrate(osc, reducers, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX, integrator=None):
+    """Integrate like coupled.Simulation.run, feeding every row to the reducers instead of a file.
+
+    A reducer implements start(osc, dt, n_rows), update(row, t, osc) and result(), which
+    returns a dict of arrays; the merged dicts of all reducers are returned.
+    """
+    integrator = integrator if integrator is not None else VerletIntegrator()
+    n_rows = count_steps(dt, t_max)
+
+    osc.initialize()
+    integrator.initialize(osc, dt)
+    for reducer in reducers:
+        reducer.start(osc, dt, n_rows)
+
+    t = 0.0
+    for row in range(n_rows):
+        for reducer in reducers:
+            reducer.update(row, t, osc)
+        integrator.step(osc, t, dt)
+        t += dt
+
+    results = {}
+    for reducer in reducers:
+        results.update(reducer.result())
+    return results
+
+
+def simulate(osc, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX, integrator=None, out=None):
+    """Integrate like coupled.Simulation.run and return (t, positions).
+
+    With out=None the trajectory is kept in memory; otherwise it is streamed to the .npy
+    file at out (same layout as output.txt: time followed by every position) and the
+    returned arrays are views of its memmap.
+    """
+    results = integrate(osc, [Trajectory(out)], dt, t_max, integrator)
+    return results["t"], results["positions"]
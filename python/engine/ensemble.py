@@ -0,0 +1,83 @@
+import numpy as np
+
+from engine.coupled import DEFAULT_A, DEFAULT_DT, DEFAULT_GAMMA, DEFAULT_M, DEFAULT_N, DEFAULT_T_MAX, integrate
+from engine.reducers import StationaryAmplitude
+
+
+def _column(value, runs):
+    return np.broadcast_to(np.reshape(np.asarray(value, dtype=float), (-1, 1)), (runs, 1)).copy()
+
+
+class CoupledEnsemble:
+    """Batch of independent coupled chains advanced together as a (runs, N) state array.
+
+    Every parameter may be a scalar or one value per run.
+    """
+
+    def __init__(self, omega, k, n=DEFAULT_N, m=DEFAULT_M, gamma=DEFAULT_GAMMA, a=DEFAULT_A):
+        omega = np.atleast_1d(np.asarray(omega, dtype=float))
+        k = np.atleast_1d(np.asarray(k, dtype=float))
+        self.runs = max(omega.size, k.size)
+        self.n = n
+
+        # Parámetros como columnas para que se apliquen fila a fila
+        self.omega = _column(omega, self.runs)
+        self.k = _column(k, self.runs)
+        self.m = _column(m, self.runs)
+        self.gamma = _column(gamma, self.runs)
+        self.a = _column(a, self.runs)
+
+        self.positions = np.zeros((self.runs, n))
+        self.velocities = np.zeros((self.runs, n))
+        self.accelerations = np.zeros((self.runs, n))
+
+        # Buffers auxiliares para no reservar memoria en cada paso
+        self._left = np.zeros((self.runs, n))
+        self._right = np.zeros((self.runs, n))
+        self._drive = np.zeros((self.runs, 1))
+
+    def initialize(self):
+        self.positions.fill(0.0)
+        self.velocities.fill(0.0)
+        self.compute_accelerations(0.0)
+
+    def compute_accelerations(self, t):
+        y = self.positions
+        left = self._left
+        right = self._right
+        acc = self.accelerations
+
+        # Forzado A*sin(wt) de cada corrida sobre su partícula 0
+        np.multiply(self.omega, t, out=self._drive)
+        np.sin(self._drive, out=self._drive)
+        np.multiply(self.a, self._drive, out=self._drive)
+        np.subtract(y[:, :1], self._drive, out=left[:, :1])
+        np.subtract(y[:, 1:], y[:, :-1], out=left[:, 1:])
+
+        np.subtract(y[:, :-1], y[:, 1:], out=right[:, :-1])
+        right[:, -1] = y[:, -1]
+
+        # Fi = -k(yi-yi-1) - k(yi-yi+1) - γvi
+        np.multiply(left, -self.k, out=acc)
+        np.multiply(right, self.k, out=right)
+        np.subtract(acc, right, out=acc)
+        np.multiply(self.velocities, self.gamma, out=right)
+        np.subtract(acc, right, out=acc)
+        np.divide(acc, self.m, out=acc)
+
+
+def simulate_stationary_amplitudes(ensemble, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX, stationary_time=0.0, integrator=None):
+    """Integrate the ensemble and return each run's max |y| over t >= stationary_time.
+
+    The maximum is reduced while integrating, so trajectories are never stored.
+    """
+    results = integrate(ensemble, [StationaryAmplitude(stationary_time)], dt, t_max, integrator)
+    return results["stationary_amplitude"]
+
+
+def stationary_amplitudes(omegas, ks, stationary_time, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX, **params):
+    """Stationary max amplitude for every broadcast (omega, k) pair, in a single vectorized pass."""
+    omegas, ks = np.broadcast_arrays(np.asarray(omegas, dtype=float), np.asarray(ks, dtype=float))
+    ensemble = CoupledEnsemble(omegas.ravel(), ks.ravel(), **params)
+    amplitudes = simulate_stationary_amplitudes(ensemble, dt, t_max, stationary_time)
+    return amplitudes.reshape(omegas.shape)
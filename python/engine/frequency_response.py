@@ -0,0 +1,58 @@
+import numpy as np
+
+from engine.coupled import DEFAULT_A, DEFAULT_GAMMA, DEFAULT_K, DEFAULT_M, DEFAULT_N
+
+# Puntos por defecto de la grilla de ω para buscar el pico de resonancia
+DEFAULT_GRID_POINTS = 4000
+
+
+def response_profile(omegas, n=DEFAULT_N, m=DEFAULT_M, k=DEFAULT_K, gamma=DEFAULT_GAMMA, a=DEFAULT_A):
+    """Complex steady-state amplitude Y_i(ω) of every particle, with shape (len(omegas), n).
+
+    With y_i = Im(Y_i e^{iωt}) each ω gives the tridiagonal system
+    (2k - mω² + iγω) Y_i - k Y_{i-1} - k Y_{i+1} = 0, with Y_{-1} = A (drive) and Y_n = 0 (wall),
+    solved for all ω at once with the Thomas algorithm.
+    """
+    omegas = np.atleast_1d(np.asarray(omegas, dtype=float))
+    diagonal = 2 * k - m * omegas**2 + 1j * gamma * omegas
+
+    c = np.empty((n, len(omegas)), dtype=complex)
+    d = np.empty((n, len(omegas)), dtype=complex)
+
+    # Eliminación hacia adelante; el forzado entra como término independiente de la partícula 0
+    c[0] = -k / diagonal
+    d[0] = k * a / diagonal
+    for i in range(1, n):
+        denominator = diagonal + k * c[i - 1]
+        c[i] = -k / denominator
+        d[i] = k * d[i - 1] / denominator
+
+    # Sustitución hacia atrás
+    for i in range(n - 2, -1, -1):
+        d[i] -= c[i] * d[i + 1]
+
+    return d.T
+
+
+def steady_state_amplitudes(omegas, **params):
+    """Stationary max |y| over the chain for every ω, the quantity plotted by amplitud_maxima_vs_w."""
+    return np.max(np.abs(response_profile(omegas, **params)), axis=1)
+
+
+def normal_mode_frequencies(n=DEFAULT_N, m=DEFAULT_M, k=DEFAULT_K):
+    """Undamped normal-mode frequencies of n particles between two fixed ends."""
+    modes = np.arange(1, n + 1)
+    return 2 * np.sqrt(k / m) * np.sin(modes * np.pi / (2 * (n + 1)))
+
+
+def resonance_frequency(w_min, w_max, points=DEFAULT_GRID_POINTS, **params):
+    """ω in [w_min, w_max] with the largest stationary amplitude, and that amplitude."""
+    omegas = np.linspace(w_min, w_max, points)
+    amplitudes = steady_state_amplitudes(omegas, **params)
+    i = np.argmax(amplitudes)
+
+    # Refinamos alrededor del máximo de la grilla
+    fine = np.linspace(omegas[max(i - 1, 0)], omegas[min(i + 1, points - 1)], points)
+    fine_amplitudes = steady_state_amplitudes(fine, **params)
+    j = np.argmax(fine_amplitudes)
+    return fine[j], fine_amplitudes[j]
@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from engine.coupled import (
+    DEFAULT_A,
+    DEFAULT_DT,
+    DEFAULT_GAMMA,
+    DEFAULT_K,
+    DEFAULT_M,
+    DEFAULT_N,
+    DEFAULT_OMEGA,
+    DEFAULT_T_MAX,
+    CoupledOscillator,
+    integrate,
+)
+from engine.reducers import DEFAULT_FRAMES, Energy, Envelope, Frames, MaxAmplitude, StationaryAmplitude
+from utils.utils import REDUCTIONS_FILE
+
+# Parámetros aceptados por línea de comandos, con el mismo nombre que en Config.java
+DEFAULTS = {
+    "DT": DEFAULT_DT,
+    "T_MAX": DEFAULT_T_MAX,
+    "M": DEFAULT_M,
+    "K": DEFAULT_K,
+    "GAMMA": DEFAULT_GAMMA,
+    "OMEGA": DEFAULT_OMEGA,
+    "N": DEFAULT_N,
+    "STATIONARY_TIME": 0.0,
+    "FRAMES": DEFAULT_FRAMES,
+    "OUTPUT_DIR": "results",
+}
+
+
+def parse_arguments(args):
+    params = dict(DEFAULTS)
+    for arg in args:
+        parts = arg.split("=")
+        if len(parts) != 2:
+            print(f"Invalid argument format: {arg}")
+            continue
+
+        key, value = parts
+        if key not in params:
+            print(f"Unknown argument: {key}")
+            continue
+
+        try:
+            params[key] = type(DEFAULTS[key])(value)
+        except ValueError:
+            print(f"Invalid value for {key}: {value}")
+
+    return params
+
+
+def save_config(output_dir, params):
+    # Mismo formato que coupled.Main.saveConfig para que los scripts de ej2 lo lean igual
+    config = {
+        "oscillatorType": "coupled",
+        "simulation": {"dt": params["DT"], "tMax": params["T_MAX"]},
+        "parameters": {
+            "N": params["N"],
+            "m": params["M"],
+            "k": params["K"],
+            "gamma": params["GAMMA"],
+            "A": DEFAULT_A,
+            "omega": params["OMEGA"],
+        },
+    }
+    with open(os.path.join(output_dir, "config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+
+
+def run(output_dir, params, reducers):
+    """Integrate a coupled run with the given reducers and save only their results."""
+    os.makedirs(output_dir, exist_ok=True)
+    save_config(output_dir, params)
+
+    osc = CoupledOscillator(params["N"], params["M"], params["K"], params["GAMMA"], DEFAULT_A, params["OMEGA"])
+    results = integrate(osc, reducers, params["DT"], params["T_MAX"])
+    np.savez(os.path.join(output_dir, REDUCTIONS_FILE), **results)
+    return results
+
+
+def main():
+    params = parse_arguments(sys.argv[1:])
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_dir = os.path.join(params["OUTPUT_DIR"], "ej2", timestamp)
+
+    reducers = [
+        MaxAmplitude(),
+        StationaryAmplitude(params["STATIONARY_TIME"]),
+        Envelope(params["STATIONARY_TIME"]),
+        Frames(params["FRAMES"]),
+        Energy(),
+    ]
+    run(output_dir, params, reducers)
+    print(f"Reductions saved to {os.path.join(output_dir, REDUCTIONS_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import numpy as np
+
+# Cantidad máxima de frames que guarda Frames (la misma que usa ej2.animacion)
+DEFAULT_FRAMES = 1000
+
+
+class Trajectory:
+    """Keeps every row (the whole output.txt), in memory or in a .npy memmap at out."""
+
+    def __init__(self, out=None):
+        self.out = out
+
+    def start(self, osc, dt, n_rows):
+        shape = (n_rows, osc.n + 1)
+        if self.out is None:
+            self._data = np.empty(shape)
+        else:
+            self._data = np.lib.format.open_memmap(self.out, mode="w+", dtype=np.float64, shape=shape)
+
+    def update(self, row, t, osc):
+        self._data[row, 0] = t
+        self._data[row, 1:] = osc.positions
+
+    def result(self):
+        if self.out is not None:
+            self._data.flush()
+        return {"t": self._data[:, 0], "positions": self._data[:, 1:]}
+
+
+class MaxAmplitude:
+    """Max |y| over all particles at every step."""
+
+    def start(self, osc, dt, n_rows):
+        self._t = np.empty(n_rows)
+        self._max = np.empty((n_rows,) + osc.positions.shape[:-1])
+        self._abs = np.empty_like(osc.positions)
+
+    def update(self, row, t, osc):
+        self._t[row] = t
+        np.abs(osc.positions, out=self._abs)
+        np.max(self._abs, axis=-1, out=self._max[row, ...])
+
+    def result(self):
+        return {"max_amplitudes_t": self._t, "max_amplitudes": self._max}
+
+
+class StationaryAmplitude:
+    """Max |y| over all particles and every step with t >= stationary_time."""
+
+    def __init__(self, stationary_time):
+        self.stationary_time = stationary_time
+
+    def start(self, osc, dt, n_rows):
+        self._amplitude = np.zeros(osc.positions.shape[:-1])
+        self._abs = np.empty_like(osc.positions)
+        self._row_max = np.empty(osc.positions.shape[:-1])
+
+    def update(self, row, t, osc):
+        if t >= self.stationary_time:
+            np.abs(osc.positions, out=self._abs)
+            np.max(self._abs, axis=-1, out=self._row_max)
+            np.maximum(self._amplitude, self._row_max, out=self._amplitude)
+
+    def result(self):
+        return {"stationary_amplitude": self._amplitude}
+
+
+class Envelope:
+    """Max |y| reached by each particle over every step with t >= stationary_time."""
+
+    def __init__(self, stationary_time=0.0):
+        self.stationary_time = stationary_time
+
+    def start(self, osc, dt, n_rows):
+        self._envelope = np.zeros_like(osc.positions)
+        self._abs = np.empty_like(osc.positions)
+
+    def update(self, row, t, osc):
+        if t >= self.stationary_time:
+            np.abs(osc.positions, out=self._abs)
+            np.maximum(self._envelope, self._abs, out=self._envelope)
+
+    def result(self):
+        return {"envelope": self._envelope}
+
+
+class Frames:
+    """Up to n_frames evenly spaced snapshots, plus the min/max position over the whole run."""
+
+    def __init__(self, n_frames=DEFAULT_FRAMES):
+        self.n_frames = n_frames
+
+    def start(self, osc, dt, n_rows):
+        self._indices = np.linspace(0, n_rows - 1, min(self.n_frames, n_rows), dtype=int)
+        self._t = np.empty(len(self._indices))
+        self._frames = np.empty((len(self._indices),) + osc.positions.shape)
+        self._next = 0
+        self._range = np.array([np.inf, -np.inf])
+
+    def update(self, row, t, osc):
+        self._range[0] = min(self._range[0], np.min(osc.positions))
+        self._range[1] = max(self._range[1], np.max(osc.positions))
+
+        # Puede haber índices repetidos si hay menos filas que frames
+        while self._next < len(self._indices) and self._indices[self._next] == row:
+            self._t[self._next] = t
+            self._frames[self._next] = osc.positions
+            self._next += 1
+
+    def result(self):
+        return {"frames_t": self._t, "frames": self._frames, "frames_y_range": self._range}
+
+
+class Energy:
+    """Energy balance at every step, like coupled.EnergyAccumulator in Java.
+
+    Kinetic and spring potential energy (including the drive and wall springs) of the current
+    state, plus the energy dissipated by damping and the work done by the drive, integrated with
+    the trapezoidal rule; kinetic + potential - work + dissipated stays at its initial value up to
+    integration error.
+    """
+
+    def start(self, osc, dt, n_rows):
+        shape = (n_rows,) + osc.positions.shape[:-1]
+        self._t = np.empty(n_rows)
+        self._kinetic = np.empty(shape)
+        self._potential = np.empty(shape)
+        self._dissipated = np.empty(shape)
+        self._work = np.empty(shape)
+        self._buffer = np.empty_like(osc.positions)
+        self._last = None
+
+    def update(self, row, t, osc):
+        y = osc.positions
+        buffer = self._buffer
+        self._t[row] = t
+
+        np.multiply(osc.velocities, osc.velocities, out=buffer)
+        np.sum(0.5 * osc.m * buffer, axis=-1, out=self._kinetic[row, ...])
+        dissipation = np.sum(osc.gamma * buffer, axis=-1)
+
+        # Elongación de cada resorte: forzado-0, i-1 a i, y N-1 a la pared
+        drive = osc.a * np.sin(osc.omega * t)
+        np.subtract(y[..., 1:], y[..., :-1], out=buffer[..., 1:])
+        buffer[..., :1] = y[..., :1] - drive
+        np.multiply(buffer, buffer, out=buffer)
+        wall = y[..., -1:] * y[..., -1:]
+        np.sum(0.5 * osc.k * (np.sum(buffer, axis=-1, keepdims=True) + wall), axis=-1, out=self._potential[row, ...])
+
+        # Potencia del forzado sobre el resorte de la partícula 0: k (A sin(wt) - y0) A w cos(wt)
+        drive_power = (osc.k * (drive - y[..., :1]) * osc.a * osc.omega * np.cos(osc.omega * t))[..., 0]
+
+        # Integrales por trapecios desde la fila anterior
+        if self._last is None:
+            self._dissipated[row, ...] = 0.0
+            self._work[row, ...] = 0.0
+        else:
+            last_t, last_dissipation, last_drive_power = self._last
+            half = 0.5 * (t - last_t)
+            self._dissipated[row, ...] = self._dissipated[row - 1] + half * (last_dissipation + dissipation)
+            self._work[row, ...] = self._work[row - 1] + half * (last_drive_power + drive_power)
+        self._last = (t, dissipation, drive_power)
+
+    def result(self):
+        return {
+            "energy_t": self._t,
+            "kinetic": self._kinetic,
+            "potential": self._potential,
+            "dissipated": self._dissipated,
+            "work": self._work,
+        }
@@ -0,0 +1,132 @@
+from functools import partial
+
+import numpy as np
+
+from engine.coupled import DEFAULT_DT, DEFAULT_M, DEFAULT_N, DEFAULT_T_MAX
+from engine.ensemble import stationary_amplitudes
+from engine.frequency_response import normal_mode_frequencies, resonance_frequency
+from utils.sweep import DEFAULT_WORKERS, run_sweep
+
+# Extremos del intervalo inicial relativos a la resonancia de la respuesta en frecuencia: el pico
+# simulado queda a menos de un 2% de ella, así que ±5% lo encierra
+DEFAULT_BRACKET = (0.95, 1.05)
+
+# Tolerancia del refinamiento relativa a ω y máximo de simulaciones por k después de las tres iniciales
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_MAX_EVALUATIONS = 3
+
+# Factor con el que se amplía el intervalo si el máximo queda en un borde
+EXPANSION = 1.618
+
+
+def _no_memory(item):
+    return 0
+
+
+def _parabola_vertex(points):
+    """ω of the vertex of the parabola through three (ω, amplitude) points sorted by ω, or None if it is not a maximum."""
+    # Cerca de una resonancia 1/A² es casi una parábola en ω, mucho más que A
+    (x0, y0), (x1, y1), (x2, y2) = [(x, -1.0 / (y * y)) for x, y in points]
+    # La parábola es cóncava si el punto del medio queda por encima de la cuerda
+    if y1 <= y0 + (y2 - y0) * (x1 - x0) / (x2 - x0):
+        return None
+
+    numerator = (x1 - x0) ** 2 * (y1 - y2) - (x1 - x2) ** 2 * (y1 - y0)
+    denominator = (x1 - x0) * (y1 - y2) - (x1 - x2) * (y1 - y0)
+    return x1 - 0.5 * numerator / denominator
+
+
+def refine_resonance(
+    item, stationary_time, tol=DEFAULT_TOLERANCE, max_evaluations=DEFAULT_MAX_EVALUATIONS, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX, **params
+):
+    """Refine the resonance of item=(k, points) by successive parabolic interpolation.
+
+    points are the (ω, amplitude) pairs already simulated around the peak, so the first vertex
+    costs no simulation. While the best point is at an end the interval is expanded towards it
+    instead. Stops once the next vertex is within tol·ω of an evaluated point or after
+    max_evaluations simulations. Returns (w0, amplitude, evaluations).
+    """
+    k, points = item
+    points = sorted(points)
+    evaluations = 0
+
+    while evaluations < max_evaluations:
+        best = max(range(len(points)), key=lambda i: points[i][1])
+        x_best = points[best][0]
+
+        # Con el máximo en un extremo el pico está afuera: nos alejamos del vecino
+        if best == 0 or best == len(points) - 1:
+            neighbour = points[1 if best == 0 else -2][0]
+            vertex = x_best + EXPANSION * (x_best - neighbour)
+            if vertex <= 0:
+                break
+
+        # Vértice de la parábola por el mejor punto y sus vecinos; si cae afuera bisecamos el lado más largo
+        else:
+            left, right = points[best - 1][0], points[best + 1][0]
+            vertex = _parabola_vertex(points[best - 1 : best + 2])
+            if vertex is None or not left < vertex < right:
+                vertex = 0.5 * (x_best + (left if x_best - left > right - x_best else right))
+
+            if min(abs(vertex - x) for x, _ in points) < tol * x_best:
+                break
+
+        amplitude = stationary_amplitudes([vertex], [k], stationary_time, dt, t_max, **params)[0]
+        points = sorted(points + [(vertex, amplitude)])
+        evaluations += 1
+
+    w0, amplitude = max(points, key=lambda point: point[1])
+    return w0, amplitude, evaluations
+
+
+def resonance_estimate(k, **params):
+    """ω₀ of the exact frequency response of the chain, searched around its first normal mode."""
+    first_mode = normal_mode_frequencies(params.get("n", DEFAULT_N), params.get("m", DEFAULT_M), k)[0]
+    return resonance_frequency(0.5 * first_mode, 1.5 * first_mode, k=k, **params)[0]
+
+
+def find_resonances(
+    ks,
+    stationary_time,
+    bracket=DEFAULT_BRACKET,
+    tol=DEFAULT_TOLERANCE,
+    max_evaluations=DEFAULT_MAX_EVALUATIONS,
+    workers=DEFAULT_WORKERS,
+    dt=DEFAULT_DT,
+    t_max=DEFAULT_T_MAX,
+    **params,
+):
+    """Find ω₀(k) for every k, returning (w0s, amplitudes).
+
+    Starts from three ω per k, bracket[0]·ω*, ω* and bracket[1]·ω* around the resonance ω* of
+    the frequency response, simulated for all k in a single ensemble pass; each peak is then
+    refined with at most max_evaluations more simulations per k (see refine_resonance).
+    """
+    ks = np.asarray(ks, dtype=float)
+
+    # Los tres puntos iniciales de todos los k juntos en una sola pasada del ensamble
+    estimates = np.array([resonance_estimate(k, **params) for k in ks])
+    omegas = estimates[:, None] * np.array([bracket[0], 1.0, bracket[1]])[None, :]
+    initial = stationary_amplitudes(omegas, ks[:, None], stationary_time, dt, t_max, **params)
+    items = [(float(k), [(float(w), float(amplitude)) for w, amplitude in zip(omegas[i], initial[i])]) for i, k in enumerate(ks)]
+
+    # Refinamos cada k en paralelo
+    refine = partial(
+        refine_resonance, stationary_time=stationary_time, tol=tol, max_evaluations=max_evaluations, dt=dt, t_max=t_max, **params
+    )
+    refined = run_sweep(refine, items, workers, estimate=_no_memory)
+
+    w0s = np.empty(len(ks))
+    amplitudes = np.empty(len(ks))
+    for i, result in enumerate(refined):
+        j = np.argmax(initial[i])
+        w0s[i], amplitudes[i] = omegas[i, j], initial[i, j]
+
+        # Nos quedamos con el refinado salvo que haya fallado o sea peor que los puntos iniciales
+        if result is not None and result[1] >= initial[i, j]:
+            w0s[i], amplitudes[i] = result[0], result[1]
+            print(f"k = {ks[i]}: ω₀ = {w0s[i]:.4f} (3 + {result[2]} simulations)")
+        else:
+            print(f"k = {ks[i]}: ω₀ = {w0s[i]:.4f} (initial bracket)")
+
+    return w0s, amplitudes
@@ -0,0 +1,277 @@
+import copy
+import math
+
+import numpy as np
+
+# Mismos valores por defecto que Config.SINGLE_* en Java
+DEFAULT_M = 70.0
+DEFAULT_K = 1e4
+DEFAULT_GAMMA = 100.0
+DEFAULT_X0 = 1.0
+DEFAULT_V0 = -DEFAULT_X0 * DEFAULT_GAMMA / (2 * DEFAULT_M)
+DEFAULT_DT = 0.01
+DEFAULT_T_MAX = 5.0
+
+# Filas que se juntan por bloque antes de reducirlas con NumPy
+DEFAULT_CHUNK_STEPS = 1024
+
+# Hasta esta cantidad de corridas conviene integrarlas de a una con floats de Python
+SCALAR_RUNS = 32
+
+
+class SingleOscillator:
+    """NumPy port of single.Oscillator; every parameter may be a scalar or an array of runs."""
+
+    def __init__(self, m=DEFAULT_M, k=DEFAULT_K, gamma=DEFAULT_GAMMA, x0=DEFAULT_X0, v0=DEFAULT_V0):
+        self.m = np.asarray(m, dtype=float)
+        self.k = np.asarray(k, dtype=float)
+        self.gamma = np.asarray(gamma, dtype=float)
+        self.x0 = np.asarray(x0, dtype=float)
+        self.v0 = np.asarray(v0, dtype=float)
+
+    def acceleration(self, x, v):
+        return (-self.k * x - self.gamma * v) / self.m
+
+    def analytical(self, t):
+        omega0 = np.sqrt(self.k / self.m)
+        gamma_m = self.gamma / (2 * self.m)
+        omega_d = np.sqrt(omega0 * omega0 - gamma_m * gamma_m)
+        return np.exp(-gamma_m * t) * (self.x0 * np.cos(omega_d * t) + (self.v0 + gamma_m * self.x0) / omega_d * np.sin(omega_d * t))
+
+    def jerk(self, x, v):
+        a = self.acceleration(x, v)
+        return (-self.k * v - self.gamma * a) / self.m
+
+    def snap(self, x, v):
+        a = self.acceleration(x, v)
+        j = self.jerk(x, v)
+        return (-self.k * a - self.gamma * j) / self.m
+
+    def crackle(self, x, v):
+        j = self.jerk(x, v)
+        s = self.snap(x, v)
+        return (-self.k * j - self.gamma * s) / self.m
+
+
+# Los integradores avanzan una tupla de componentes con la posición en el índice 0 y la
+# velocidad en el 1; cada componente puede ser un float de Python (una corrida) o un arreglo
+# (corridas en lote), con las mismas operaciones y en el mismo orden que en Java.
+
+
+class _Integrator:
+    """State as an array (..., d) on top of initial_values and advance, which work on d-tuples."""
+
+    def initial_state(self, osc, dt):
+        return np.stack(np.broadcast_arrays(*self.initial_values(osc, dt), dt)[:-1], axis=-1)
+
+    def step(self, osc, state, dt):
+        return np.stack(self.advance(osc, tuple(np.moveaxis(state, -1, 0)), dt), axis=-1)
+
+
+class VerletIntegrator(_Integrator):
+    """Port of single.integrators.VerletIntegrator, with state (x, v, xPrev)."""
+
+    size = 3
+
+    def initial_values(self, osc, dt):
+        x, v = osc.x0, osc.v0
+        a = osc.acceleration(x, v)
+        return x, v, x - v * dt + 0.5 * a * dt * dt
+
+    def advance(self, osc, values, dt):
+        x, v, x_prev = values
+        a = osc.acceleration(x, v)
+        x_next = 2 * x - x_prev + dt * dt * a
+        v_next = (x_next - x_prev) / (2 * dt)
+        return x_next, v_next, x
+
+
+class BeemanIntegrator(_Integrator):
+    """Port of single.integrators.BeemanIntegrator, with state (x, v, aPrev)."""
+
+    size = 3
+
+    def initial_values(self, osc, dt):
+        x, v = osc.x0, osc.v0
+        return x, v, osc.acceleration(x, v)
+
+    def advance(self, osc, values, dt):
+        x, v, a_prev = values
+        a = osc.acceleration(x, v)
+        x_next = x + v * dt + (2.0 / 3.0 * a - 1.0 / 6.0 * a_prev) * dt * dt
+
+        # Predecir velocidad para estimar aNext
+        v_pred = v + (3.0 / 2.0 * a - 1.0 / 2.0 * a_prev) * dt
+        a_next = osc.acceleration(x_next, v_pred)
+        v_next = v + (1.0 / 3.0 * a_next + 5.0 / 6.0 * a - 1.0 / 6.0 * a_prev) * dt
+        return x_next, v_next, a
+
+
+class Gear5Integrator(_Integrator):
+    """Port of single.integrators.Gear5Integrator, with state (r0, ..., r5)."""
+
+    size = 6
+    alpha = (3.0 / 16, 251.0 / 360, 1.0, 11.0 / 18, 1.0 / 6, 1.0 / 60)
+
+    def initial_values(self, osc, dt):
+        x, v = osc.x0, osc.v0
+        return x, v, osc.acceleration(x, v), osc.jerk(x, v), osc.snap(x, v), osc.crackle(x, v)
+
+    def advance(self, osc, values, dt):
+        r = values
+        dt1, dt2, dt3, dt4, dt5 = dt, dt * dt / 2, dt * dt * dt / 6, dt * dt * dt * dt / 24, dt * dt * dt * dt * dt / 120
+
+        # Predicción
+        pred = [
+            r[0] + dt1 * r[1] + dt2 * r[2] + dt3 * r[3] + dt4 * r[4] + dt5 * r[5],
+            r[1] + dt1 * r[2] + dt2 * r[3] + dt3 * r[4] + dt4 * r[5],
+            r[2] + dt1 * r[3] + dt2 * r[4] + dt3 * r[5],
+            r[3] + dt1 * r[4] + dt2 * r[5],
+            r[4] + dt1 * r[5],
+            r[5],
+        ]
+
+        # Corrección
+        delta_r2 = (osc.acceleration(pred[0], pred[1]) - pred[2]) * dt * dt / 2
+        return tuple(pred[i] + self.alpha[i] * delta_r2 * (1.0 / dt) ** i for i in range(6))
+
+
+INTEGRATORS = {
+    "Verlet": VerletIntegrator,
+    "Beeman": BeemanIntegrator,
+    "Gear5": Gear5Integrator,
+}
+
+
+def simulate(osc, integrator, dt=DEFAULT_DT, t_max=DEFAULT_T_MAX):
+    """Integrate step by step like single.Simulation.run, returning (t, x, v, analytical)."""
+    state = integrator.initial_state(osc, dt)
+    t_values, x_values, v_values = [], [], []
+    t = 0.0
+
+    while t <= t_max:
+        t_values.append(t)
+        x_values.append(state[..., 0])
+        v_values.append(state[..., 1])
+        state = integrator.step(osc, state, dt)
+        t += dt
+
+    t_values = np.array(t_values)
+    return t_values, np.array(x_values), np.array(v_values), osc.analytical(t_values.reshape((-1,) + np.ndim(osc.x0) * (1,)))
+
+
+def _run_oscillator(osc, shape, index):
+    """Copy of osc for the run at index of a batch of the given shape, with Python float parameters."""
+    run = copy.copy(osc)
+    for name in ("m", "k", "gamma", "x0", "v0"):
+        setattr(run, name, float(np.broadcast_to(getattr(osc, name), shape)[index]))
+    return run
+
+
+def _propagate(osc, integrator, dts, t_max, chunk_steps):
+    """Yield (times, active, x, v) for blocks of chunk_steps rows, integrating step by step.
+
+    Rows and times (t accumulated as t += dt up to t_max) follow single.Simulation.run exactly,
+    with the same operations in the same order, so results match the Java loop. osc and dts are
+    either Python floats (one run) or arrays (a batch advanced together, where runs that already
+    reached t_max keep stepping but are marked inactive).
+    """
+    values = integrator.initial_values(osc, dts)
+    if np.ndim(dts) > 0:
+        values = np.broadcast_arrays(*values, dts)[:-1]
+    t = 0.0 * dts
+
+    while True:
+        times, positions, velocities = [], [], []
+        for _ in range(chunk_steps):
+            times.append(t)
+            positions.append(values[0])
+            velocities.append(values[1])
+            values = integrator.advance(osc, values, dts)
+            t = t + dts
+
+        times = np.array(times)
+        active = times <= t_max
+        if not np.any(active):
+            return
+        yield times, active, np.array(positions), np.array(velocities)
+
+
+def _map_runs(reduce, osc, integrator, dts, t_max, chunk_steps):
+    """reduce(osc, integrator, dts, t_max, chunk_steps) over every run, as arrays of the batch shape.
+
+    With up to SCALAR_RUNS runs each one is stepped on its own with Python floats; the fixed cost
+    of every NumPy operation would otherwise dominate, since every step depends on the previous one.
+    """
+    dts = np.asarray(dts, dtype=float)
+    shape = np.broadcast_shapes(*(np.shape(value) for value in (dts, osc.m, osc.k, osc.gamma, osc.x0, osc.v0)))
+    if math.prod(shape) > SCALAR_RUNS:
+        return reduce(osc, integrator, np.broadcast_to(dts, shape), t_max, chunk_steps)
+
+    results = None
+    for index in np.ndindex(shape):
+        run_dt = float(np.broadcast_to(dts, shape)[index])
+        values = reduce(_run_oscillator(osc, shape, index), integrator, run_dt, t_max, chunk_steps)
+        if results is None:
+            results = tuple(np.empty(shape) for _ in values)
+        for result, value in zip(results, values):
+            result[index] = value
+    return results
+
+
+def _errors(osc, integrator, dts, t_max, chunk_steps):
+    squared_sum = 0.0
+    max_abs = 0.0
+    count = 0
+
+    for times, active, positions, _ in _propagate(osc, integrator, dts, t_max, chunk_steps):
+        errors = np.where(active, positions - osc.analytical(times), 0.0)
+        squared_sum = squared_sum + np.sum(errors**2, axis=0)
+        max_abs = np.maximum(max_abs, np.max(np.abs(errors), axis=0))
+        count = count + np.sum(active, axis=0)
+
+    return squared_sum / count, max_abs
+
+
+def error_vs_dt(osc, integrator, dts, t_max=DEFAULT_T_MAX, chunk_steps=DEFAULT_CHUNK_STEPS):
+    """MSE and max |x - analytical| of the integrator for every dt (or parameter set) at once.
+
+    Rows and times follow single.Simulation.run exactly (see _propagate).
+    """
+    return _map_runs(_errors, osc, integrator, dts, t_max, chunk_steps)
+
+
+def _energy_drift(osc, integrator, dts, t_max, chunk_steps):
+    initial = 0.5 * osc.m * osc.v0**2 + 0.5 * osc.k * osc.x0**2
+    dissipated = 0.0
+    drift = 0.0
+    last = None
+
+    for times, active, x, v in _propagate(osc, integrator, dts, t_max, chunk_steps):
+        power = osc.gamma * v * v
+
+        # Trapecios entre filas consecutivas, empezando por la última del bloque anterior
+        if last is None:
+            last = (times[:1], power[:1])
+        previous_t = np.concatenate([last[0], times[:-1]])
+        previous_power = np.concatenate([last[1], power[:-1]])
+        areas = np.where(active, 0.5 * (times - previous_t) * (power + previous_power), 0.0)
+        accumulated = dissipated + np.cumsum(areas, axis=0)
+
+        balance = 0.5 * osc.m * v * v + 0.5 * osc.k * x * x + accumulated
+        drift = np.maximum(drift, np.max(np.where(active, np.abs(balance - initial), 0.0), axis=0))
+
+        dissipated = accumulated[-1]
+        last = (times[-1:], power[-1:])
+
+    return (drift / initial,)
+
+
+def energy_vs_dt(osc, integrator, dts, t_max=DEFAULT_T_MAX, chunk_steps=DEFAULT_CHUNK_STEPS):
+    """Max relative drift |K + U + D - E0| / E0 of the energy balance for every dt at once.
+
+    K and U are the kinetic and spring energy of every row and D the energy dissipated by damping,
+    integral of gamma * v^2 with the trapezoidal rule, like single.EnergyAccumulator in Java.
+    Rows follow single.Simulation.run exactly (see _propagate).
+    """
+    return _map_runs(_energy_drift, osc, integrator, dts, t_max, chunk_steps)[0]
@@ -0,0 +1,160 @@
+import importlib
+import os
+import shlex
+import sys
+import time
+import traceback
+
+from utils import profiling
+
+# Subcomandos y el módulo que implementa cada uno; se importan recién al usarlos
+COMMANDS = {
+    "comparacion_integradores": (
+        "ej1.comparacion_integradores",
+        "<sim_dir>: single oscillator integrators against the analytical solution",
+    ),
+    "ecm_integradores": ("ej1.ecm_integradores", "<sim_dir>: MSE of every single oscillator integrator"),
+    "ecm_vs_dt": ("ej1.ecm_vs_dt", "<sim_dir> ... [--workers=N]: MSE vs dt from simulation runs"),
+    "ecm_vs_dt_engine": ("ej1.ecm_vs_dt_engine", "[dt ...]: MSE vs dt with the Python engine, without output files"),
+    "energia_vs_dt": ("ej1.energia_vs_dt", "[dt ...]: energy balance drift vs dt with the Python engine"),
+    "animacion": ("ej2.animacion", "<sim_dir> [--workers=N]: animation of the chain"),
+    "amplitud_maxima_vs_t": ("ej2.amplitud_maxima_vs_t", "<sim_dir>: max |y| over time"),
+    "amplitud_maxima_vs_t_multiple": (
+        "ej2.amplitud_maxima_vs_t_multiple",
+        "<sim_dir> ... [--workers=N]: max |y| over time of several runs",
+    ),
+    "amplitud_maxima_vs_dt": ("ej2.amplitud_maxima_vs_dt", "<sim_dir> ... [--workers=N]: max |y| vs dt"),
+    "amplitud_maxima_vs_w": ("ej2.amplitud_maxima_vs_w", "<stationary_time> <sim_dir> ... [--workers=N]: stationary amplitude vs ω"),
+    "amplitud_maxima_vs_w_ensamble": (
+        "ej2.amplitud_maxima_vs_w_ensamble",
+        "<stationary_time> <k> <w_min> <w_max> <n_omegas>: batched ensemble sweep",
+    ),
+    "w_vs_k": ("ej2.w_vs_k", "[stationary_time k ... [--bracket=LOW,HIGH]]: ω₀ vs k"),
+    "espectro": ("ej2.espectro", "<sim_dir> [stationary_time] [segment]: spectrum and dispersion relation"),
+    "balance_energia": ("ej2.balance_energia", "<sim_dir>: energy balance (kinetic, potential, dissipated, drive work)"),
+    "engine": ("engine.main", "[PARAM=VALUE ...]: coupled run in Python saving only reductions"),
+    "catalog": ("utils.catalog", "[query]: update or query the run catalog"),
+    "benchmark": ("utils.benchmark", "[PARAM=VALUE ...]: benchmark the simulation and analysis stages"),
+}
+
+# Separa los análisis de una misma invocación
+BATCH_SEPARATOR = "+"
+
+USAGE = f"""Usage: python -m tp4 [--show] [--profile[=table|<trace>.json]] [--file=<batch>]
+                      <command> [args] [{BATCH_SEPARATOR} <command> [args] ...]
+
+Runs every command in this process, so modules are imported and data is loaded only once.
+Plots are saved with a non-interactive backend unless --show is given. A batch file has one
+command per line (empty lines and lines starting with # are ignored).
+
+Commands:
+"""
+
+
+def print_usage():
+    width = max(len(name) for name in COMMANDS)
+    print(USAGE + "\n".join(f"  {name:<{width}}  {description}" for name, (_, description) in COMMANDS.items()))
+
+
+def split_batch(args):
+    """Split args at every separator into (command, args) pairs."""
+    commands = []
+    current = []
+    for arg in args + [BATCH_SEPARATOR]:
+        if arg != BATCH_SEPARATOR:
+            current.append(arg)
+        elif current:
+            commands.append((current[0], current[1:]))
+            current = []
+    return commands
+
+
+def read_batch_file(path):
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f]
+    return [(words[0], words[1:]) for words in (shlex.split(line) for line in lines if line and not line.startswith("#"))]
+
+
+def run_command(name, args):
+    """Run the main of a command with args as its sys.argv, returning its exit code."""
+    module = importlib.import_module(COMMANDS[name][0])
+    previous_argv = sys.argv
+    sys.argv = [name] + args
+    try:
+        module.main()
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = previous_argv
+        # Cerramos las figuras para que no se acumulen a lo largo del lote
+        pyplot = sys.modules.get("matplotlib.pyplot")
+        if pyplot is not None:
+            pyplot.close("all")
+
+
+def main():
+    args = sys.argv[1:]
+    show = False
+    profile = None
+    commands = []
+
+    while args and args[0].startswith("-"):
+        option = args.pop(0)
+        if option == "--show":
+            show = True
+        elif option == "--profile" or option.startswith("--profile="):
+            profile = option.split("=", 1)[1] if "=" in option else "table"
+        elif option.startswith("--file="):
+            try:
+                commands.extend(read_batch_file(option.split("=", 1)[1]))
+            except OSError as e:
+                print(f"Error: Could not read batch file: {e}")
+                sys.exit(1)
+        elif option in ("-h", "--help"):
+            print_usage()
+            return
+        else:
+            print(f"Unknown option: {option}")
+            sys.exit(1)
+
+    commands.extend(split_batch(args))
+    if not commands:
+        print_usage()
+        sys.exit(1)
+
+    unknown = [name for name, _ in commands if name not in COMMANDS]
+    if unknown:
+        print(f"Unknown commands: {', '.join(unknown)}")
+        sys.exit(1)
+
+    # El backend se elige antes de que algún comando importe matplotlib
+    if not show:
+        os.environ.setdefault("MPLBACKEND", "Agg")
+
+    if profile is not None:
+        profiling.enable(profile)
+
+    failed = 0
+    for name, command_args in commands:
+        if len(commands) > 1:
+            print(f"==> {name} {' '.join(command_args)}")
+
+        start = time.perf_counter()
+        with profiling.stage(name):
+            code = run_command(name, command_args)
+        if code != 0:
+            failed += 1
+            print(f"Warning: {name} exited with code {code}")
+        elif len(commands) > 1:
+            print(f"<== {name} done in {time.perf_counter() - start:.2f} s")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
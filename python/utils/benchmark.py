@@ -0,0 +1,455 @@
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+import numpy as np
+
+from engine.coupled import DEFAULT_A, DEFAULT_GAMMA, DEFAULT_K, DEFAULT_M, DEFAULT_OMEGA, count_steps
+from engine.frequency_response import response_profile
+from utils.cache import BINARY_MAGIC, BINARY_VERSION, cache_paths
+from utils.catalog import RESULTS_DIR
+from utils.sweep import DEFAULT_WORKERS
+
+REPO_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+JAVA_CLASSES = os.path.join(REPO_DIR, "target", "classes")
+BENCHMARKS_DIR = os.path.join(RESULTS_DIR, "benchmarks")
+
+# Filas que se generan por bloque al escribir las corridas sintéticas
+GENERATE_CHUNK_ROWS = 1000
+
+# Las filas binarias empiezan alineadas a este tamaño, igual que en BinaryRowWriter
+BINARY_ALIGNMENT = 64
+
+# Un tiempo que crece más que esto respecto de la referencia se marca como regresión
+REGRESSION_THRESHOLD = 1.10
+
+# Parámetros aceptados por línea de comandos; N, DT y T_MAX aceptan listas separadas por comas
+DEFAULTS = {
+    "N": "100,1000",
+    "DT": "1e-3",
+    "T_MAX": "2",
+    "STAGES": "all",
+    "REPEAT": "3",
+    "WORKERS": str(DEFAULT_WORKERS),
+    "OUTPUT": "",
+    "COMPARE": "",
+    "WORK_DIR": "",
+}
+
+
+def _case_rows(case):
+    return count_steps(case["dt"], case["t_max"])
+
+
+def _text_path(case_dir):
+    return os.path.join(case_dir, "text", "output.txt")
+
+
+def _binary_path(case_dir):
+    return os.path.join(case_dir, "binary", "output.bin")
+
+
+def _synthetic_blocks(case):
+    """Exact steady state of the chain in blocks of rows (t, y_0 .. y_{N-1}), with t accumulated like Java."""
+    response = response_profile(DEFAULT_OMEGA, case["n"], DEFAULT_M, DEFAULT_K, DEFAULT_GAMMA, DEFAULT_A)[0]
+    rows = _case_rows(case)
+    t = 0.0
+    for start in range(0, rows, GENERATE_CHUNK_ROWS):
+        increments = np.full(min(GENERATE_CHUNK_ROWS, rows - start), case["dt"])
+        increments[0] = t
+        times = np.add.accumulate(increments)
+        t = times[-1] + case["dt"]
+        yield np.column_stack([times, np.imag(np.exp(1j * DEFAULT_OMEGA * times)[:, None] * response)])
+
+
+def _write_config(run_dir, case):
+    # Mismo formato que coupled.Main.saveConfig
+    config = {
+        "oscillatorType": "coupled",
+        "simulation": {"dt": case["dt"], "tMax": case["t_max"]},
+        "parameters": {"N": case["n"], "m": DEFAULT_M, "k": DEFAULT_K, "gamma": DEFAULT_GAMMA, "A": DEFAULT_A, "omega": DEFAULT_OMEGA},
+    }
+    os.makedirs(run_dir, exist_ok=True)
+    with open(os.path.join(run_dir, "config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+
+
+def write_text_run(filename, case):
+    """Synthetic output.txt of the given size, tab separated like TextRowWriter.
+
+    Numbers are written with repr, the shortest string that round-trips like Double.toString in
+    Java; only the exponent notation differs ("1e-05" against "1.0E-5"), so sizes match real runs
+    to about 0.1%.
+    """
+    _write_config(os.path.dirname(filename), case)
+    with open(filename, "w") as f:
+        for block in _synthetic_blocks(case):
+            f.writelines("\t".join(map(repr, row)) + "\n" for row in block.tolist())
+
+
+def write_binary_run(filename, case):
+    """Synthetic FORMAT=FLOAT64 output with the same header as BinaryRowWriter."""
+    _write_config(os.path.dirname(filename), case)
+    header = {"dtype": "<f8", "dt": case["dt"], "N": case["n"], "columns": ["t"] + [f"y{i}" for i in range(case["n"])]}
+    encoded = json.dumps(header).encode("ascii")
+    prefix = len(BINARY_MAGIC) + 8
+    encoded += b" " * (-(prefix + len(encoded)) % BINARY_ALIGNMENT)
+
+    with open(filename, "wb") as f:
+        f.write(BINARY_MAGIC)
+        f.write(np.array([BINARY_VERSION, len(encoded)], dtype="<i4").tobytes())
+        f.write(encoded)
+        for block in _synthetic_blocks(case):
+            f.write(block.astype("<f8").tobytes())
+
+
+# Cada etapa recibe el directorio del caso y sus parámetros, y devuelve los segundos medidos,
+# las filas procesadas, los bytes procesados y métricas extra (o None si no se puede correr).
+
+
+def _stage_write_text(case_dir, case):
+    filename = _text_path(case_dir)
+    start = time.perf_counter()
+    write_text_run(filename, case)
+    return time.perf_counter() - start, _case_rows(case), os.path.getsize(filename), {}
+
+
+def _stage_parse_text(case_dir, case):
+    from utils.utils import load_data
+
+    filename = _text_path(case_dir)
+    start = time.perf_counter()
+    t, _ = load_data(filename, use_cache=False)
+    elapsed = time.perf_counter() - start
+    if t is None:
+        raise ValueError(f"Could not parse {filename}")
+    return elapsed, len(t), os.path.getsize(filename), {}
+
+
+def _stage_build_cache(case_dir, case):
+    from utils.cache import build_cache
+
+    filename = _text_path(case_dir)
+    for path in cache_paths(filename):
+        if os.path.exists(path):
+            os.remove(path)
+
+    start = time.perf_counter()
+    data = build_cache(filename)
+    return time.perf_counter() - start, len(data), os.path.getsize(filename), {}
+
+
+def _stage_load_cached(case_dir, case):
+    from utils.cache import load_cached
+    from utils.utils import load_data
+
+    # El caché se arma antes, sin medir, si la etapa build_cache no corrió
+    filename = _text_path(case_dir)
+    load_cached(filename)
+    start = time.perf_counter()
+    t, positions = load_data(filename)
+    # Tocamos todos los valores para que el memmap realmente se lea
+    float(np.sum(positions))
+    return time.perf_counter() - start, len(t), positions.nbytes + t.nbytes, {}
+
+
+def _stage_load_binary(case_dir, case):
+    from utils.cache import load_binary
+
+    filename = _binary_path(case_dir)
+    if not os.path.exists(filename):
+        write_binary_run(filename, case)
+
+    start = time.perf_counter()
+    data = load_binary(filename)
+    float(np.sum(data[:, 1:]))
+    return time.perf_counter() - start, len(data), os.path.getsize(filename), {}
+
+
+def _stage_max_amplitudes(case_dir, case):
+    from utils.cache import load_cached
+    from utils.utils import compute_max_amplitudes
+
+    # Sobre el caché binario, como en el uso normal, pero sin el caché de magnitudes derivadas
+    filename = _text_path(case_dir)
+    load_cached(filename)
+    start = time.perf_counter()
+    t, _ = compute_max_amplitudes.__wrapped__(filename)
+    elapsed = time.perf_counter() - start
+    if t is None:
+        raise ValueError(f"Could not compute max amplitudes of {filename}")
+    return elapsed, len(t), len(t) * (case["n"] + 1) * 8, {}
+
+
+def _stage_animation(case_dir, case):
+    if shutil.which("ffmpeg") is None:
+        return None
+
+    from ej2.animacion import DPI, FIGSIZE, load_frames, save_animation
+
+    filename = _text_path(case_dir)
+    config = {"simulation": {"dt": case["dt"], "tMax": case["t_max"]}}
+    start = time.perf_counter()
+    positions, y_min, y_max = load_frames(filename, config)
+    save_animation(positions, np.arange(positions.shape[1]), y_min, y_max, os.path.join(case_dir, "animation.mp4"), case["workers"])
+    elapsed = time.perf_counter() - start
+
+    # Bytes de video crudo que se rasterizan y se mandan a ffmpeg
+    frame_bytes = int(FIGSIZE[0] * DPI) * int(FIGSIZE[1] * DPI) * 3
+    return elapsed, len(positions), len(positions) * frame_bytes, {"frames_per_s": len(positions) / elapsed}
+
+
+def _run_java(case_dir, case, extra_args):
+    params = [f"N={case['n']}", f"DT={case['dt']}", f"T_MAX={case['t_max']}"]
+    command = ["java", "-classpath", JAVA_CLASSES, "ar.edu.itba.ss.coupled.Main"] + params
+    work_dir = os.path.join(case_dir, "java")
+    os.makedirs(work_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    subprocess.run(command + extra_args, cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+
+    outputs = [os.path.join(root, name) for root, _, names in os.walk(work_dir) for name in names if name.startswith("output")]
+    written = sum(os.path.getsize(path) for path in outputs)
+    shutil.rmtree(work_dir)
+    return elapsed, written
+
+
+def _stage_java(case_dir, case):
+    if shutil.which("java") is None or not os.path.isdir(JAVA_CLASSES):
+        return None
+
+    # Guardando una sola fila queda solo la física (más el arranque de la JVM, que se cancela al restar)
+    rows = _case_rows(case)
+    physics, _ = _run_java(case_dir, case, [f"SAVE_EVERY={rows + 1}"])
+    total, written = _run_java(case_dir, case, [])
+    output = max(total - physics, 0.0)
+    extra = {
+        "physics_seconds": physics,
+        "physics_steps_per_s": rows / physics,
+        "output_seconds": output,
+        "output_share": output / total,
+    }
+    return total, rows, written, extra
+
+
+STAGES = {
+    "write_text": _stage_write_text,
+    "java": _stage_java,
+    "parse_text": _stage_parse_text,
+    "build_cache": _stage_build_cache,
+    "load_cached": _stage_load_cached,
+    "load_binary": _stage_load_binary,
+    "max_amplitudes": _stage_max_amplitudes,
+    "animation": _stage_animation,
+}
+
+
+def _peak_rss_mb():
+    # ru_maxrss está en KiB en Linux; los hijos cuentan para ffmpeg, java y los procesos de rasterizado
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def _measure(stage, case_dir, case):
+    """Run one stage in the current (fresh) process and return its metrics, or None if skipped."""
+    base_rss = _peak_rss_mb()
+    result = STAGES[stage](case_dir, case)
+    if result is None:
+        return None
+
+    seconds, rows, processed_bytes, extra = result
+    return {
+        "seconds": seconds,
+        "steps_per_s": rows / seconds if seconds > 0 else None,
+        "mb_per_s": processed_bytes / seconds / 1e6 if seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "base_rss_mb": base_rss,
+        **extra,
+    }
+
+
+def run_stage(stage, case_dir, case, repeat):
+    """Best of repeat runs of stage, each in a new process so peak RSS belongs to that stage only."""
+    best = None
+    context = get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            metrics = pool.submit(_measure, stage, case_dir, case).result()
+        if metrics is None:
+            return {"skipped": True}
+        if best is None or metrics["seconds"] < best["seconds"]:
+            best = metrics
+    return best
+
+
+def run_case(case, stages, repeat, work_dir):
+    """Generate the synthetic run of a case and time the requested stages on it."""
+    case_dir = os.path.join(work_dir, f"n{case['n']}_dt{case['dt']:g}_t{case['t_max']:g}")
+    os.makedirs(case_dir, exist_ok=True)
+
+    # La salida de texto la necesitan las demás etapas, así que se escribe siempre primero
+    results = {}
+    metrics = run_stage("write_text", case_dir, case, repeat if "write_text" in stages else 1)
+    if "write_text" in stages:
+        results["write_text"] = metrics
+
+    for stage in stages:
+        if stage == "write_text":
+            continue
+        print(f"  {stage}...", flush=True)
+        results[stage] = run_stage(stage, case_dir, case, repeat)
+
+    return {
+        "n": case["n"],
+        "dt": case["dt"],
+        "t_max": case["t_max"],
+        "rows": _case_rows(case),
+        "text_bytes": os.path.getsize(_text_path(case_dir)),
+        "stages": results,
+    }
+
+
+def _git(*args):
+    return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def _git_revision():
+    try:
+        commit = _git("rev-parse", "--short", "HEAD")
+        dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def _case_key(case):
+    return (case["n"], case["dt"], case["t_max"])
+
+
+def print_results(results, baseline=None):
+    """Table of every case and stage, with the time ratio against a baseline results dict if given."""
+    reference = {}
+    if baseline is not None:
+        for case in baseline["cases"]:
+            for stage, metrics in case["stages"].items():
+                if not metrics.get("skipped"):
+                    reference[_case_key(case) + (stage,)] = metrics["seconds"]
+
+    header = f"{'N':>6} {'dt':>8} {'t_max':>6} {'stage':<15} {'seconds':>10} {'steps/s':>12} {'MB/s':>9} {'RSS MB':>8}"
+    if baseline is not None:
+        header += f" {'vs ' + str(baseline.get('commit')):>14}"
+    print(header)
+
+    regressions = 0
+    for case in results["cases"]:
+        for stage, metrics in case["stages"].items():
+            line = f"{case['n']:>6} {case['dt']:>8g} {case['t_max']:>6g} {stage:<15} "
+            if metrics.get("skipped"):
+                print(line + f"{'skipped':>10}")
+                continue
+
+            line += f"{metrics['seconds']:>10.4f} {metrics['steps_per_s'] or 0:>12.4g} "
+            line += f"{metrics['mb_per_s'] or 0:>9.2f} {metrics['peak_rss_mb']:>8.1f}"
+            previous = reference.get(_case_key(case) + (stage,))
+            if previous:
+                ratio = metrics["seconds"] / previous
+                flag = " SLOWER" if ratio > REGRESSION_THRESHOLD else ""
+                regressions += bool(flag)
+                line += f" {ratio:>13.2f}x{flag}"
+            print(line)
+
+    return regressions
+
+
+def parse_arguments(args):
+    params = dict(DEFAULTS)
+    for arg in args:
+        parts = arg.split("=", 1)
+        if len(parts) != 2 or parts[0] not in params:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+        params[parts[0]] = parts[1]
+
+    try:
+        grid = {
+            "n": [int(value) for value in params["N"].split(",")],
+            "dt": [float(value) for value in params["DT"].split(",")],
+            "t_max": [float(value) for value in params["T_MAX"].split(",")],
+        }
+        repeat = max(1, int(params["REPEAT"]))
+        workers = max(1, int(params["WORKERS"]))
+    except ValueError as e:
+        print(f"Invalid benchmark argument: {e}")
+        sys.exit(1)
+
+    stages = list(STAGES) if params["STAGES"] == "all" else params["STAGES"].split(",")
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"Unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+        sys.exit(1)
+
+    grid_points = itertools.product(grid["n"], grid["dt"], grid["t_max"])
+    cases = [{"n": n, "dt": dt, "t_max": t_max, "workers": workers} for n, dt, t_max in grid_points]
+    return cases, stages, repeat, params
+
+
+def main():
+    cases, stages, repeat, params = parse_arguments(sys.argv[1:])
+
+    baseline = None
+    if params["COMPARE"]:
+        try:
+            with open(params["COMPARE"], "r") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read baseline {params['COMPARE']}: {e}")
+            sys.exit(1)
+
+    commit, dirty = _git_revision()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "workers": cases[0]["workers"],
+        "repeat": repeat,
+        "cases": [],
+    }
+
+    # Las corridas sintéticas se borran al terminar salvo que se indique WORK_DIR
+    work_dir = params["WORK_DIR"] or tempfile.mkdtemp(prefix="tp4-benchmark-")
+    try:
+        for case in cases:
+            print(f"N={case['n']} DT={case['dt']:g} T_MAX={case['t_max']:g} ({_case_rows(case)} rows)", flush=True)
+            results["cases"].append(run_case(case, stages, repeat, work_dir))
+    finally:
+        if not params["WORK_DIR"]:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = params["OUTPUT"] or os.path.join(BENCHMARKS_DIR, f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    regressions = print_results(results, baseline)
+    print(f"Results saved to {output}")
+    if regressions:
+        print(f"Warning: {regressions} stages are more than {REGRESSION_THRESHOLD:.2f}x slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
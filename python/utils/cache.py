@@ -0,0 +1,214 @@
+import itertools
+import json
+import os
+
+import numpy as np
+
+from utils import profiling
+
+# Versión del formato del caché, se incrementa si cambia la forma de armarlo
+CACHE_VERSION = 1
+
+# Formato binario que escriben los Simulation de Java con FORMAT=FLOAT64 o FORMAT=FLOAT32
+BINARY_MAGIC = b"TP4B"
+BINARY_VERSION = 1
+BINARY_EXTENSION = ".bin"
+
+# Cantidad de filas por bloque al leer los archivos de salida
+DEFAULT_CHUNK_SIZE = 1000
+
+# Salidas binarias ya verificadas en este proceso, por (ruta, tamaño, mtime), para no recorrerlas de nuevo
+_finite_binaries = set()
+
+
+def read_text_blocks(filename, chunk_size=DEFAULT_CHUNK_SIZE, skip_rows=0):
+    """Yield raw row blocks from a tab-separated output file, raising ValueError on NaN/Inf."""
+    with open(filename, "r") as f:
+        # Salteamos las filas pedidas sin parsearlas
+        if skip_rows > 0:
+            next(itertools.islice(f, skip_rows, skip_rows), None)
+
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+
+            with profiling.stage("loadtxt", filename):
+                if profiling.enabled():
+                    profiling.add_bytes(sum(map(len, lines)))
+                block = np.loadtxt(lines, ndmin=2)
+
+            with profiling.stage("validate", filename):
+                if not np.all(np.isfinite(block)):
+                    raise ValueError("Data file contains NaN or Inf values")
+
+            yield block
+
+
+def binary_path(filename):
+    """Path of the binary output (FORMAT=FLOAT64/FLOAT32 in Java) that replaces a text output file."""
+    base, _ = os.path.splitext(filename)
+    return base + BINARY_EXTENSION
+
+
+def resolve_output(filename):
+    """filename, or its binary sibling when the run was written in binary format."""
+    if not os.path.exists(filename) and os.path.exists(binary_path(filename)):
+        return binary_path(filename)
+    return filename
+
+
+def is_binary(filename):
+    return filename.endswith(BINARY_EXTENSION)
+
+
+def read_binary_header(filename):
+    """Header of a binary output file (dtype, dt, N, columns) and the offset of its first row."""
+    with open(filename, "rb") as f:
+        prefix = f.read(len(BINARY_MAGIC) + 8)
+        if len(prefix) < len(BINARY_MAGIC) + 8 or prefix[: len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError(f"{filename} is not a binary simulation output")
+
+        version, length = np.frombuffer(prefix[len(BINARY_MAGIC) :], dtype="<i4")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported binary output version {version} in {filename}")
+
+        header = json.loads(f.read(length).decode("ascii"))
+
+    return header, len(prefix) + int(length)
+
+
+def _check_finite(data, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Raise ValueError if a mapped binary output has NaN/Inf values, scanning it once per process."""
+    stat = os.stat(filename)
+    key = (os.path.realpath(filename), stat.st_size, stat.st_mtime_ns)
+    if key in _finite_binaries:
+        return
+
+    # Recorremos por bloques para no traer todo el archivo a memoria a la vez
+    with profiling.stage("validate", filename):
+        for start in range(0, len(data), chunk_size):
+            if not np.all(np.isfinite(data[start : start + chunk_size])):
+                raise ValueError("Data file contains NaN or Inf values")
+    _finite_binaries.add(key)
+
+
+def load_binary(filename, validate=True):
+    """Zero-copy read-only (rows, columns) view of a binary output file.
+
+    Like the text outputs, raises ValueError on NaN/Inf unless validate is False. A truncated
+    last row (a run that was interrupted) is ignored.
+    """
+    header, offset = read_binary_header(filename)
+    dtype = np.dtype(header["dtype"])
+    n_cols = len(header["columns"])
+    n_rows = (os.path.getsize(filename) - offset) // (dtype.itemsize * n_cols)
+    if n_rows == 0:
+        raise ValueError("Data file is empty")
+
+    profiling.add_bytes(n_rows * n_cols * dtype.itemsize)
+    data = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=(n_rows, n_cols))
+    if validate:
+        _check_finite(data, filename)
+    return data
+
+
+def cache_paths(filename):
+    """Paths of the binary array and its header for a simulation output file."""
+    base, _ = os.path.splitext(filename)
+    return base + ".npy", base + ".npy.json"
+
+
+def _source_fingerprint(filename):
+    stat = os.stat(filename)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_cache_valid(filename):
+    npy_path, header_path = cache_paths(filename)
+    if not os.path.exists(npy_path) or not os.path.exists(header_path):
+        return False
+
+    try:
+        with open(header_path, "r") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    return header.get("version") == CACHE_VERSION and header.get("source") == _source_fingerprint(filename)
+
+
+@profiling.profiled("build_cache")
+def build_cache(filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert a text output file into a .npy array next to it and write its header."""
+    npy_path, header_path = cache_paths(filename)
+    source = _source_fingerprint(filename)
+
+    # Contamos filas y columnas sin parsear para poder reservar el arreglo de una vez
+    with open(filename, "r") as f:
+        first_line = f.readline()
+        n_rows = (1 if first_line.strip() else 0) + sum(1 for line in f if line.strip())
+    if n_rows == 0:
+        raise ValueError("Data file is empty")
+    n_cols = len(first_line.split())
+
+    tmp_path = npy_path + ".tmp"
+    data = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float64, shape=(n_rows, n_cols))
+    try:
+        row = 0
+        for block in read_text_blocks(filename, chunk_size):
+            data[row : row + len(block)] = block
+            row += len(block)
+        data.flush()
+    except Exception:
+        del data
+        os.remove(tmp_path)
+        raise
+    del data
+    os.replace(tmp_path, npy_path)
+
+    header = {
+        "version": CACHE_VERSION,
+        "dtype": "float64",
+        "shape": [n_rows, n_cols],
+        "dt": None,
+        "source": source,
+    }
+    data = np.load(npy_path, mmap_mode="r")
+    if n_rows > 1:
+        header["dt"] = float(data[1, 0] - data[0, 0])
+
+    with open(header_path, "w") as f:
+        json.dump(header, f, indent=2)
+
+    return data
+
+
+def load_cached(filename, build=True):
+    """Zero-copy read-only view of an output file, (re)building its cache when stale.
+
+    Binary outputs (or a text path whose run was written in binary) are mapped directly.
+    Returns None if the cache cannot be written, or if it is stale and build is False,
+    so callers can fall back to the text file.
+    """
+    filename = resolve_output(filename)
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"{filename} not found")
+
+    if is_binary(filename):
+        return load_binary(filename)
+
+    if is_cache_valid(filename):
+        npy_path, _ = cache_paths(filename)
+        data = np.load(npy_path, mmap_mode="r")
+        profiling.add_bytes(data.nbytes)
+        return data
+
+    if not build:
+        return None
+
+    try:
+        return build_cache(filename)
+    except OSError as e:
+        print(f"Warning: Could not build binary cache for {filename}: {e}")
+        return None
@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+from utils.cache import cache_paths, is_binary, load_binary
+
+# Raíz de los resultados (la misma carpeta results/ donde escriben los Main de Java y engine.main)
+RESULTS_DIR = os.environ.get("TP4_RESULTS_DIR", os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "results")))
+CATALOG_FILE = "catalog.sqlite"
+
+# Prefijo de los argumentos que se reemplazan por los directorios que cumplen la consulta
+QUERY_PREFIX = "query:"
+
+# Tolerancia relativa para comparar parámetros de punto flotante por igualdad
+FLOAT_TOLERANCE = 1e-9
+
+# Columnas consultables y de dónde salen en config.json
+COLUMNS = {
+    "type": ("oscillatorType",),
+    "dt": ("simulation", "dt"),
+    "t_max": ("simulation", "tMax"),
+    "n": ("parameters", "N"),
+    "m": ("parameters", "m"),
+    "k": ("parameters", "k"),
+    "gamma": ("parameters", "gamma"),
+    "omega": ("parameters", "omega"),
+}
+
+# Nombres alternativos aceptados en las consultas, como aparecen en config.json o en los Main
+ALIASES = {"oscillatortype": "type", "tmax": "t_max", "w": "omega"}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT PRIMARY KEY,
+    stamp TEXT NOT NULL,
+    {", ".join(f"{column} {'TEXT' if column == 'type' else 'REAL'}" for column in COLUMNS)},
+    output_bytes INTEGER,
+    rows INTEGER,
+    stationary_amplitude REAL,
+    config TEXT
+)
+"""
+
+
+def _stamp(sim_dir):
+    # La fecha de config.json y la del directorio, que cambia al agregarse salidas, cachés o reducciones
+    return f"{os.stat(os.path.join(sim_dir, 'config.json')).st_mtime_ns}:{os.stat(sim_dir).st_mtime_ns}"
+
+
+def _lookup(config, keys):
+    for key in keys:
+        if not isinstance(config, dict) or key not in config:
+            return None
+        config = config[key]
+    return config
+
+
+def _describe(sim_dir):
+    """Catalog row of a run: its config parameters, output sizes and already cached metrics."""
+    with open(os.path.join(sim_dir, "config.json"), "r") as f:
+        config = json.load(f)
+
+    outputs = [entry.path for entry in os.scandir(sim_dir) if entry.name.startswith("output") and entry.name.endswith((".txt", ".bin"))]
+    row = {column: _lookup(config, keys) for column, keys in COLUMNS.items()}
+    row["output_bytes"] = sum(os.path.getsize(path) for path in outputs)
+
+    # Filas de la salida, si es binaria o ya tiene caché binario
+    row["rows"] = None
+    for path in outputs:
+        if is_binary(path):
+            row["rows"] = len(load_binary(path, validate=False))
+            break
+
+        _, header_path = cache_paths(path)
+        if os.path.exists(header_path):
+            with open(header_path, "r") as f:
+                row["rows"] = json.load(f)["shape"][0]
+            break
+
+    # Amplitud estacionaria, detectada por la simulación de Java o guardada por engine.main
+    row["stationary_amplitude"] = _lookup(config, ("steadyState", "amplitude"))
+    reductions = os.path.join(sim_dir, "reductions.npz")
+    if os.path.exists(reductions):
+        with np.load(reductions) as data:
+            if "stationary_amplitude" in data.files:
+                row["stationary_amplitude"] = float(data["stationary_amplitude"])
+
+    row["config"] = json.dumps(config)
+    return row
+
+
+def _find_runs(root):
+    # Las corridas viven en results/ej1/<timestamp> y results/ej2/<timestamp>
+    for exercise in sorted(os.scandir(root), key=lambda entry: entry.name):
+        if not exercise.is_dir():
+            continue
+        for run in sorted(os.scandir(exercise.path), key=lambda entry: entry.name):
+            if run.is_dir() and os.path.exists(os.path.join(run.path, "config.json")):
+                yield run.path
+
+
+def open_catalog(root=RESULTS_DIR):
+    os.makedirs(root, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(root, CATALOG_FILE))
+    connection.execute(SCHEMA)
+    return connection
+
+
+def update_catalog(root=RESULTS_DIR):
+    """Bring the catalog of root up to date, re-reading only runs whose stamp changed.
+
+    Returns the open connection and the number of runs (re)indexed.
+    """
+    connection = open_catalog(root)
+    known = dict(connection.execute("SELECT path, stamp FROM runs"))
+    updated = 0
+
+    with connection:
+        for sim_dir in _find_runs(root):
+            try:
+                stamp = _stamp(sim_dir)
+                if known.pop(sim_dir, None) == stamp:
+                    continue
+                row = _describe(sim_dir)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Could not index {sim_dir}: {e}")
+                continue
+
+            row.update(path=sim_dir, stamp=stamp)
+            columns = ", ".join(row)
+            placeholders = ", ".join(f":{column}" for column in row)
+            connection.execute(f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", row)
+            updated += 1
+
+        # Corridas que ya no existen
+        connection.executemany("DELETE FROM runs WHERE path = ?", [(path,) for path in known])
+
+    return connection, updated
+
+
+def parse_query(query):
+    """SQL condition and arguments for a query like "coupled,k=1000,dt=1e-4,omega=10..20".
+
+    A bare word filters by oscillator type, key=value compares with a relative tolerance and
+    key=a..b selects a closed range (either bound may be omitted). Raises ValueError.
+    """
+    conditions = []
+    arguments = []
+    for term in filter(None, (term.strip() for term in query.split(","))):
+        if "=" not in term:
+            conditions.append("type = ?")
+            arguments.append(term)
+            continue
+
+        key, value = (part.strip() for part in term.split("=", 1))
+        column = ALIASES.get(key.lower(), key.lower())
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown query key: {key}")
+
+        if column == "type":
+            conditions.append("type = ?")
+            arguments.append(value)
+        elif ".." in value:
+            low, high = value.split("..", 1)
+            if low:
+                conditions.append(f"{column} >= ?")
+                arguments.append(float(low))
+            if high:
+                conditions.append(f"{column} <= ?")
+                arguments.append(float(high))
+        else:
+            conditions.append(f"ABS({column} - ?) <= ? * MAX(ABS(?), 1e-300)")
+            arguments.extend([float(value), FLOAT_TOLERANCE, float(value)])
+
+    return " AND ".join(conditions) or "1", arguments
+
+
+def query_runs(query, root=RESULTS_DIR):
+    """Directories of the runs under root matching query, after updating the catalog."""
+    condition, arguments = parse_query(query)
+    connection, _ = update_catalog(root)
+    with connection:
+        rows = connection.execute(f"SELECT path FROM runs WHERE {condition} ORDER BY path", arguments).fetchall()
+    connection.close()
+    return [path for (path,) in rows]
+
+
+def expand_run_args(args, root=RESULTS_DIR):
+    """Replace every "query:<query>" argument by the run directories it matches."""
+    expanded = []
+    for arg in args:
+        if not arg.startswith(QUERY_PREFIX):
+            expanded.append(arg)
+            continue
+
+        try:
+            sim_dirs = query_runs(arg[len(QUERY_PREFIX) :], root)
+        except (ValueError, OSError, sqlite3.Error) as e:
+            print(f"Error: Invalid query '{arg}': {e}")
+            sys.exit(1)
+
+        if not sim_dirs:
+            print(f"Warning: No runs match '{arg}'")
+        expanded.extend(sim_dirs)
+
+    return expanded
+
+
+def main():
+    if len(sys.argv) > 2:
+        print("Usage: python -m utils.catalog [query]")
+        sys.exit(1)
+
+    if len(sys.argv) == 1:
+        connection, updated = update_catalog()
+        connection.close()
+        print(f"Indexed {updated} new or modified runs")
+        return
+
+    for sim_dir in expand_run_args([QUERY_PREFIX + sys.argv[1]]):
+        print(sim_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import profiling
+from utils.cache import resolve_output
+
+# Directorio y presupuesto de disco del caché de magnitudes derivadas
+DERIVED_CACHE_DIR = os.environ.get("TP4_DERIVED_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tp4-simulacion"))
+DERIVED_CACHE_MAX_BYTES = int(float(os.environ.get("TP4_DERIVED_CACHE_MAX_BYTES", 2e9)))
+
+# Resultados que se mantienen además en memoria, para que varios gráficos del mismo proceso
+# (por ejemplo un lote de tp4) compartan lo ya cargado
+DERIVED_MEMORY_ENTRIES = int(os.environ.get("TP4_DERIVED_MEMORY_ENTRIES", 32))
+_memory = OrderedDict()
+
+
+def _hash(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _entry_prefix(filename, name, params):
+    return _hash({"source": os.path.realpath(filename), "name": name, "params": params})
+
+
+def _fingerprint(filename):
+    stat = os.stat(filename)
+    return _hash({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+
+
+def _load_entry(path):
+    with np.load(path) as data:
+        if "value" in data.files:
+            return data["value"]
+        return tuple(data[f"arr_{i}"] for i in range(len(data.files)))
+
+
+def _store_entry(path, result):
+    tmp_path = path + ".tmp.npz"
+    if isinstance(result, np.ndarray):
+        np.savez(tmp_path, value=result)
+    else:
+        np.savez(tmp_path, *result)
+    os.replace(tmp_path, path)
+
+
+def _remember(path, result):
+    # Los arreglos compartidos quedan de solo lectura para que ningún script los modifique
+    for array in [result] if isinstance(result, np.ndarray) else result:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
+    _memory[path] = result
+    while len(_memory) > DERIVED_MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+    return result
+
+
+def evict(max_bytes=None):
+    """Remove the least recently used entries until the cache fits in max_bytes."""
+    max_bytes = DERIVED_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for path in glob.glob(os.path.join(DERIVED_CACHE_DIR, "*.npz")):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def cached_call(filename, name, compute, **params):
+    """Return compute(filename, **params), reusing the stored result while filename is unchanged.
+
+    Results containing None (failed computations) are never stored.
+    """
+    filename = resolve_output(filename)
+    with profiling.stage(name, filename):
+        return _cached_call(filename, name, compute, **params)
+
+
+def _cached_call(filename, name, compute, **params):
+    # Sin archivo fuente no hay huella; dejamos que compute reporte el error
+    if not os.path.exists(filename):
+        return compute(filename, **params)
+
+    prefix = _entry_prefix(filename, name, params)
+    path = os.path.join(DERIVED_CACHE_DIR, f"{prefix}-{_fingerprint(filename)}.npz")
+
+    if path in _memory:
+        _memory.move_to_end(path)
+        return _memory[path]
+
+    if os.path.exists(path):
+        try:
+            result = _load_entry(path)
+            os.utime(path)  # Marcamos el uso para el LRU
+            return _remember(path, result)
+        except (OSError, ValueError):
+            pass
+
+    result = compute(filename, **params)
+    if result is None or (isinstance(result, tuple) and any(r is None for r in result)):
+        return result
+
+    try:
+        os.makedirs(DERIVED_CACHE_DIR, exist_ok=True)
+
+        # Borramos las entradas calculadas sobre versiones anteriores del archivo
+        for stale in glob.glob(os.path.join(DERIVED_CACHE_DIR, f"{prefix}-*.npz")):
+            os.remove(stale)
+
+        _store_entry(path, result)
+        evict()
+    except OSError as e:
+        print(f"Warning: Could not store derived data for {filename}: {e}")
+
+    return _remember(path, result)
+
+
+def derived(name):
+    """Decorator memoizing func(filename, ...) in the derived cache under name and its arguments."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(filename, *args, **kwargs):
+            bound = signature.bind(filename, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop(next(iter(signature.parameters)))
+            return cached_call(filename, name, func, **params)
+
+        return wrapper
+
+    return decorator
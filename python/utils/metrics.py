@@ -0,0 +1,51 @@
+from itertools import zip_longest
+
+import numpy as np
+
+from utils.utils import iter_data
+
+
+class ErrorAccumulator:
+    """Running MSE, RMS and max absolute error between numerical and analytical values.
+
+    Blocks are merged into the running mean Welford-style, so memory stays O(1).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mse = 0.0
+        self.max_abs = 0.0
+
+    def update(self, num, ana):
+        error = np.asarray(num) - np.asarray(ana)
+        if error.size == 0:
+            return
+
+        block_mse = np.mean(error**2)
+        self.count += error.size
+        self.mse += (block_mse - self.mse) * error.size / self.count
+        self.max_abs = max(self.max_abs, float(np.max(np.abs(error))))
+
+    @property
+    def rms(self):
+        return np.sqrt(self.mse)
+
+
+def stream_errors(filenames, num_col=0, ana_col=2, build_cache=False):
+    """Accumulate the error of every single oscillator output file in one lockstep pass.
+
+    Columns are indexed like load_data's positions (0 = x, 2 = analytical). Each file is
+    read exactly once: its binary cache is used if it is up to date, and not built otherwise.
+    Raises ValueError on NaN/Inf like iter_data.
+    """
+    accumulators = [ErrorAccumulator() for _ in filenames]
+    readers = [iter_data(filename, build_cache=build_cache) for filename in filenames]
+
+    # Avanzamos todos los archivos a la par, bloque a bloque
+    for blocks in zip_longest(*readers):
+        for accumulator, block in zip(accumulators, blocks):
+            if block is not None:
+                _, data = block
+                accumulator.update(data[:, num_col], data[:, ana_col])
+
+    return dict(zip(filenames, accumulators))
@@ -0,0 +1,203 @@
+import atexit
+import contextlib
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+# Con TP4_PROFILE=table (o cualquier valor) se imprime un resumen al terminar y con
+# TP4_PROFILE=<archivo>.json se guarda una traza de Chrome; se pueden combinar separados por comas.
+PROFILE_ENV = "TP4_PROFILE"
+
+# Sin perfilado stage() devuelve siempre este contexto vacío
+_NULL_STAGE = contextlib.nullcontext()
+
+# Recorder activo, o None si el perfilado está desactivado
+_recorder = None
+
+
+class Recorder:
+    """Records (name, path, start_ns, duration_ns, bytes_read, peak_alloc, pid) for every stage.
+
+    Stages nest: bytes read are added to every open stage, and the allocation peak of a stage
+    covers its children, tracked with tracemalloc.
+    """
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.events = []
+        self.stack = []
+        self.origin = time.perf_counter_ns()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, path=None):
+        current, peak = tracemalloc.get_traced_memory()
+        # El pico hasta acá le corresponde al stage padre, antes de reiniciarlo para este
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+
+        frame = {"bytes": 0, "peak": current, "base": current}
+        self.stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self.stack.pop()
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            if self.stack:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+            self.events.append((name, path, start, duration, frame["bytes"], peak - frame["base"], os.getpid()))
+
+    def add_bytes(self, count):
+        for frame in self.stack:
+            frame["bytes"] += count
+
+
+def enabled():
+    return _recorder is not None
+
+
+def enable(targets="table"):
+    """Start recording stages; at exit the report goes to every target (a .json trace path, or the table)."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.targets = targets
+        return
+
+    _recorder = Recorder(targets)
+    # Los procesos de los barridos devuelven sus stages al principal en vez de reportarlos
+    if multiprocessing.parent_process() is None:
+        atexit.register(report)
+
+
+def stage(name, path=None):
+    """Context manager recording wall time, bytes read and peak allocations of a stage of path."""
+    if _recorder is None:
+        return _NULL_STAGE
+    return _recorder.stage(name, path)
+
+
+def profiled(name):
+    """Decorator recording every call as a stage, using its first str argument as the path."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            path = next((arg for arg in args if isinstance(arg, str)), None)
+            with _recorder.stage(name, path):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def add_bytes(count):
+    """Count count bytes read (or mapped) in every open stage."""
+    if _recorder is not None:
+        _recorder.add_bytes(count)
+
+
+def run_task(func, item):
+    """func(item) recorded as a stage named after func, with item as its path."""
+    if _recorder is None:
+        return func(item)
+
+    # Las funciones parciales de los barridos no tienen nombre propio
+    name = getattr(getattr(func, "func", func), "__name__", "task")
+    with _recorder.stage(name, item if isinstance(item, str) else None):
+        return func(item)
+
+
+def collect(func, item):
+    """run_task in a worker process, returning (result, stages recorded meanwhile)."""
+    if _recorder is None:
+        return func(item), []
+
+    start = len(_recorder.events)
+    result = run_task(func, item)
+    events = _recorder.events[start:]
+    del _recorder.events[start:]
+    return result, events
+
+
+def merge(events):
+    """Add stages recorded by a worker process."""
+    if _recorder is not None:
+        _recorder.events.extend(events)
+
+
+def _directory(path):
+    if path is None:
+        return "-"
+    return path if os.path.isdir(path) else os.path.dirname(path) or "."
+
+
+def summary():
+    """Rows (stage, directory, calls, seconds, bytes read, peak allocation) sorted by total time."""
+    totals = {}
+    for name, path, _, duration, read, peak, _ in _recorder.events:
+        key = (name, _directory(path))
+        calls, seconds, total_read, max_peak = totals.get(key, (0, 0.0, 0, 0))
+        totals[key] = (calls + 1, seconds + duration / 1e9, total_read + read, max(max_peak, peak))
+
+    rows = [(name, directory, *values) for (name, directory), values in totals.items()]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def print_summary(file=sys.stdout):
+    rows = summary()
+    name_width = max([len(row[0]) for row in rows] + [5])
+    width = max([len(row[1]) for row in rows] + [9])
+    columns = f"{{:<{name_width}}} {{:<{width}}} {{:>7}} {{:>10}} {{:>10}} {{:>10}} {{:>10}}"
+    print(columns.format("Stage", "Directory", "Calls", "Total [s]", "Mean [ms]", "Read [MB]", "Peak [MB]"), file=file)
+    for name, directory, calls, seconds, read, peak in rows:
+        values = (f"{seconds:.4f}", f"{seconds / calls * 1e3:.3f}", f"{read / 1e6:.2f}", f"{peak / 1e6:.2f}")
+        print(columns.format(name, directory, calls, *values), file=file)
+
+
+def save_trace(path):
+    """Write the stages as complete events ("ph": "X") of the Chrome trace event format."""
+    events = [
+        {
+            "name": name,
+            "cat": _directory(stage_path),
+            "ph": "X",
+            "ts": (start - _recorder.origin) / 1e3,
+            "dur": duration / 1e3,
+            "pid": pid,
+            "tid": pid,
+            "args": {"path": stage_path, "bytes_read": read, "peak_alloc": peak},
+        }
+        for name, stage_path, start, duration, read, peak, pid in _recorder.events
+    ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    print(f"Profile trace saved to {path}")
+
+
+def report():
+    if _recorder is None or not _recorder.events:
+        return
+
+    for target in filter(None, (target.strip() for target in _recorder.targets.split(","))):
+        if not target.endswith(".json"):
+            print_summary()
+        else:
+            try:
+                save_trace(target)
+            except OSError as e:
+                print(f"Warning: Could not save profile trace to {target}: {e}")
+
+
+if os.environ.get(PROFILE_ENV):
+    enable(os.environ[PROFILE_ENV])
@@ -0,0 +1,72 @@
+import numpy as np
+
+from utils.utils import SAVE_DPI
+
+
+def _merge_pairs(t_min, y_min, t_max, y_max):
+    # Si la cantidad de baldes es impar duplicamos el último para poder agruparlos de a dos
+    if len(y_min) % 2:
+        t_min, y_min, t_max, y_max = (np.append(a, a[-1]) for a in (t_min, y_min, t_max, y_max))
+
+    rows = np.arange(len(y_min) // 2)
+    pick_min = 2 * rows + np.argmin(y_min.reshape(-1, 2), axis=1)
+    pick_max = 2 * rows + np.argmax(y_max.reshape(-1, 2), axis=1)
+    return t_min[pick_min], y_min[pick_min], t_max[pick_max], y_max[pick_max]
+
+
+class MinMaxPyramid:
+    """Multi-resolution min/max index of a time series.
+
+    Level L splits the series in buckets of 2^L samples and keeps the min and max of each
+    bucket together with their times, so downsampled curves still go through the exact peaks.
+    """
+
+    def __init__(self, t, y):
+        self.t = np.asarray(t, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+
+        self.levels = [(self.t, self.y, self.t, self.y)]
+        while len(self.levels[-1][1]) > 1:
+            self.levels.append(_merge_pairs(*self.levels[-1]))
+
+    def query(self, t0=None, t1=None, max_points=2000):
+        """At most about max_points (t, y) points covering [t0, t1], keeping every peak."""
+        i0 = 0 if t0 is None else max(np.searchsorted(self.t, t0, side="left") - 1, 0)
+        i1 = len(self.t) if t1 is None else min(np.searchsorted(self.t, t1, side="right") + 1, len(self.t))
+        n = i1 - i0
+        if n <= max_points:
+            return self.t[i0:i1], self.y[i0:i1]
+
+        # Nivel más fino cuyos baldes (dos puntos cada uno) entran en max_points
+        level = min(int(np.ceil(np.log2(2 * n / max_points))), len(self.levels) - 1)
+        t_min, y_min, t_max, y_max = (a[i0 >> level : ((i1 - 1) >> level) + 1] for a in self.levels[level])
+
+        # Intercalamos mínimo y máximo de cada balde en orden temporal
+        min_first = t_min <= t_max
+        t = np.empty(2 * len(t_min))
+        y = np.empty(2 * len(t_min))
+        t[0::2] = np.where(min_first, t_min, t_max)
+        y[0::2] = np.where(min_first, y_min, y_max)
+        t[1::2] = np.where(min_first, t_max, t_min)
+        y[1::2] = np.where(min_first, y_max, y_min)
+        return t, y
+
+
+def plot_downsampled(ax, t, y, *args, **kwargs):
+    """ax.plot of a long series through a MinMaxPyramid, about 2 points per saved pixel.
+
+    The curve is re-queried whenever the x-limits change, so zooming keeps full detail.
+    """
+    pyramid = MinMaxPyramid(t, y)
+
+    def max_points():
+        return 2 * int(ax.bbox.width * SAVE_DPI / ax.figure.dpi)
+
+    (line,) = ax.plot(*pyramid.query(max_points=max_points()), *args, **kwargs)
+
+    def update(ax):
+        t0, t1 = ax.get_xlim()
+        line.set_data(*pyramid.query(t0, t1, max_points()))
+
+    ax.callbacks.connect("xlim_changed", update)
+    return line
@@ -0,0 +1,126 @@
+import numpy as np
+from scipy import fft
+
+from utils.derived import derived
+from utils.utils import iter_data
+
+# Muestras por segmento de Welch y solapamiento entre segmentos consecutivos
+DEFAULT_SEGMENT = 2048
+DEFAULT_OVERLAP = 0.5
+
+
+def _segments(filename, segment, hop, stationary_time):
+    """Yield (dt, rows) for consecutive windows of segment rows, hop rows apart, reusing one buffer."""
+    buffer = None
+    filled = 0
+    dt = None
+    last_t = None
+
+    for t, positions in iter_data(filename):
+        if stationary_time is not None:
+            keep = t >= stationary_time
+            t, positions = t[keep], positions[keep]
+        if len(t) == 0:
+            continue
+
+        if buffer is None:
+            buffer = np.empty((segment, positions.shape[1]))
+        if dt is None:
+            if len(t) > 1:
+                dt = float(t[1] - t[0])
+            elif last_t is not None:
+                dt = float(t[0] - last_t)
+        last_t = t[-1]
+
+        start = 0
+        while start < len(positions):
+            count = min(segment - filled, len(positions) - start)
+            buffer[filled : filled + count] = positions[start : start + count]
+            filled += count
+            start += count
+
+            if filled == segment:
+                yield dt, buffer
+                # Corremos la ventana dejando las filas que se solapan con la siguiente
+                buffer[: segment - hop] = buffer[hop:]
+                filled = segment - hop
+
+
+# El nombre cambió al pasar la densidad a m²·s/rad, así no se reusan los resultados por Hz
+@derived("spectra_rad")
+def compute_spectra(filename, segment=DEFAULT_SEGMENT, overlap=DEFAULT_OVERLAP, stationary_time=None):
+    """Welch-averaged one-sided power spectral densities per rad/s of an output file, in one streaming pass.
+
+    Returns (omegas [rad/s], particle_psd with shape (len(omegas), N), mode_psd with shape
+    (len(omegas), N), n_segments). mode_psd is the space-time spectrum: every window is projected
+    on the normal modes of a chain with fixed ends (a DST-I over the particles) before the FFT in
+    time, so column q - 1 holds mode q. Memory is bounded by one window of segment rows.
+    """
+    try:
+        hop = max(1, int(segment * (1 - overlap)))
+        window = np.hanning(segment)[:, None]
+        particle_psd = None
+        mode_psd = None
+        n_segments = 0
+        dt = None
+
+        for dt, rows in _segments(filename, segment, hop, stationary_time):
+            # Sacamos la media de cada partícula y aplicamos la ventana de Hann
+            windowed = (rows - rows.mean(axis=0)) * window
+
+            spectrum = np.abs(fft.rfft(windowed, axis=0)) ** 2
+            modes = np.abs(fft.rfft(fft.dst(windowed, type=1, axis=1), axis=0)) ** 2
+            if particle_psd is None:
+                particle_psd = np.zeros_like(spectrum)
+                mode_psd = np.zeros_like(modes)
+            particle_psd += spectrum
+            mode_psd += modes
+            n_segments += 1
+
+        if n_segments == 0:
+            raise ValueError(f"Not enough rows for a segment of {segment} samples")
+
+        # Densidad espectral de un solo lado por rad/s (la de Welch es por Hz), promediada sobre los segmentos
+        scale = 2 * dt / (np.sum(window**2) * n_segments * 2 * np.pi)
+        omegas = 2 * np.pi * fft.rfftfreq(segment, dt)
+        particle_psd *= scale
+        mode_psd *= scale
+        particle_psd[0] /= 2
+        mode_psd[0] /= 2
+        if segment % 2 == 0:
+            particle_psd[-1] /= 2
+            mode_psd[-1] /= 2
+
+        return omegas, particle_psd, mode_psd, n_segments
+
+    except Exception as e:
+        print(f"Error loading data file {filename}: {e}")
+        return None, None, None, None
+
+
+def _refine_peaks(omegas, psd, peaks, columns=()):
+    # Interpolamos una parábola en log(potencia) sobre el pico y sus dos vecinos
+    peaks = np.clip(peaks, 1, len(psd) - 2)
+    left, center, right = (np.log(np.maximum(psd[(peaks + offset, *columns)], 1e-300)) for offset in (-1, 0, 1))
+    curvature = left - 2 * center + right
+    shift = np.where(curvature < 0, 0.5 * (left - right) / np.where(curvature < 0, curvature, 1), 0.0)
+    return omegas[peaks] + shift * (omegas[1] - omegas[0])
+
+
+def dominant_frequencies(omegas, psd, count=5):
+    """The count strongest local maxima of a spectrum, as (omegas, powers) sorted by power.
+
+    Peak frequencies are refined below the 2π / (segment dt) bin spacing by parabolic interpolation.
+    """
+    psd = np.asarray(psd)
+    peaks = np.flatnonzero((psd[1:-1] > psd[:-2]) & (psd[1:-1] >= psd[2:])) + 1
+    peaks = peaks[np.argsort(psd[peaks])[::-1][:count]]
+    return _refine_peaks(omegas, psd, peaks), psd[peaks]
+
+
+def dispersion_relation(omegas, mode_psd):
+    """Measured ω(q) of every normal mode q = 1..N: the refined frequency where its power peaks."""
+    # Ignoramos la componente continua
+    modes = np.arange(mode_psd.shape[1])
+    peaks = 1 + np.argmax(mode_psd[1:], axis=0)
+    return modes + 1, _refine_peaks(omegas, mode_psd, peaks, (modes,))
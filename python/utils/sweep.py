@@ -0,0 +1,102 @@
+import glob
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils import profiling
+
+# Cantidad de procesos por defecto para los barridos
+DEFAULT_WORKERS = int(os.environ.get("TP4_WORKERS", os.cpu_count() or 1))
+
+
+def pop_workers_arg(args):
+    """Remove a --workers=N option from args, returning (workers, remaining_args)."""
+    workers = DEFAULT_WORKERS
+    remaining = []
+    for arg in args:
+        if arg.startswith("--workers="):
+            try:
+                workers = max(1, int(arg.split("=", 1)[1]))
+            except ValueError:
+                print(f"Invalid value for workers: {arg}")
+        else:
+            remaining.append(arg)
+    return workers, remaining
+
+
+def available_memory():
+    """Available physical memory in bytes, or None if it cannot be determined."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def estimate_dir_memory(sim_dir):
+    """Upper bound on the memory a worker may touch: the size of the run's output files."""
+    return sum(os.path.getsize(path) for pattern in ("output*.txt", "output*.bin") for path in glob.glob(os.path.join(sim_dir, pattern)))
+
+
+def run_sweep(func, items, workers=DEFAULT_WORKERS, memory_budget=None, estimate=estimate_dir_memory, default=None):
+    """Run func(item) for every item in a process pool and return the results in order.
+
+    A task is only started while the estimated memory of the running ones fits in
+    memory_budget (half of the available memory by default); at least one task always runs.
+    Failed items are reported and get default as their result.
+    """
+    items = list(items)
+    results = [default] * len(items)
+    if not items:
+        return results
+
+    if memory_budget is None:
+        available = available_memory()
+        memory_budget = available // 2 if available is not None else None
+
+    costs = []
+    for item in items:
+        try:
+            costs.append(estimate(item))
+        except OSError:
+            costs.append(0)
+
+    # Con un solo worker corremos en el mismo proceso
+    if workers <= 1:
+        for i, item in enumerate(items):
+            try:
+                results[i] = profiling.run_task(func, item)
+                print(f"[{i + 1}/{len(items)}] {item}")
+            except Exception as e:
+                print(f"[{i + 1}/{len(items)}] Warning: {item} failed: {e}")
+        return results
+
+    pending = deque(range(len(items)))
+    running = {}
+    in_use = 0
+    finished = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Admitimos tareas mientras haya workers libres y entren en memoria
+            while pending and len(running) < workers:
+                cost = costs[pending[0]]
+                if running and memory_budget is not None and in_use + cost > memory_budget:
+                    break
+                i = pending.popleft()
+                running[pool.submit(profiling.collect, func, items[i])] = (i, cost)
+                in_use += cost
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, cost = running.pop(future)
+                in_use -= cost
+                finished += 1
+                try:
+                    # Los stages perfilados en el worker vuelven junto con el resultado
+                    results[i], events = future.result()
+                    profiling.merge(events)
+                    print(f"[{finished}/{len(items)}] {items[i]}")
+                except Exception as e:
+                    print(f"[{finished}/{len(items)}] Warning: {items[i]} failed: {e}")
+
+    return results
@@ -4,7 +4,19 @@ import sys
 
 import numpy as np
 
+from utils import profiling
+from utils.cache import DEFAULT_CHUNK_SIZE, is_binary, load_cached, read_text_blocks, resolve_output
+from utils.catalog import expand_run_args
+from utils.derived import derived
 
+# Archivo con los resultados reducidos que escribe engine.main
+REDUCTIONS_FILE = "reductions.npz"
+
+# Resolución con la que se guardan los gráficos
+SAVE_DPI = 300
+
+
+@profiling.profiled("read_config")
 def read_config(simulation_dir):
     config_path = os.path.join(simulation_dir, "config.json")
     if not os.path.exists(config_path):
@@ -14,12 +26,13 @@ def read_config(simulation_dir):
         return json.load(f)
 
 
-def validate_simulation_dir():
-    if len(sys.argv) != 2:
+def validate_simulation_dir(args=None):
+    args = expand_run_args(sys.argv[1:] if args is None else args)
+    if len(args) != 1:
         print("Usage: python script.py <simulation_directory>")
         sys.exit(1)
 
-    sim_dir = sys.argv[1]
+    sim_dir = args[0]
     if not os.path.exists(sim_dir):
         print(f"Directory '{sim_dir}' does not exist")
         sys.exit(1)
@@ -27,30 +40,126 @@ def validate_simulation_dir():
     return sim_dir
 
 
+@profiling.profiled("save_plot")
 def save_plot(fig, filepath):
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    fig.savefig(filepath, dpi=300, bbox_inches="tight")
+    fig.savefig(filepath, dpi=SAVE_DPI, bbox_inches="tight")
     print(f"Plot saved to {filepath}")
 
 
-def load_data(filename, stationary_time=None, dt=None):
+def _stationary_rows(stationary_time, dt):
+    if stationary_time is not None and dt is not None:
+        return int(stationary_time / dt)
+    return 0
+
+
+def iter_data(filename, chunk_size=DEFAULT_CHUNK_SIZE, stationary_time=None, dt=None, use_cache=True, build_cache=True):
+    """Yield (t, positions) blocks of at most chunk_size rows, raising ValueError on NaN/Inf.
+
+    With build_cache=False an existing binary cache is used but a missing one is not built,
+    so the text file is read exactly once.
+    """
+    skip_rows = _stationary_rows(stationary_time, dt)
+    filename = resolve_output(filename)
+    data = load_cached(filename, build_cache) if use_cache or is_binary(filename) else None
+
+    # Sin caché binario leemos el texto por bloques
+    if data is None:
+        for block in read_text_blocks(filename, chunk_size, skip_rows):
+            yield block[:, 0], block[:, 1:]
+        return
+
+    for start in range(skip_rows, len(data), chunk_size):
+        block = data[start : start + chunk_size]
+        yield block[:, 0], block[:, 1:]
+
+
+@profiling.profiled("load_data")
+def load_data(filename, stationary_time=None, dt=None, use_cache=True):
     try:
-        if stationary_time is not None and dt is not None:
-            lines_to_skip = int(stationary_time / dt)
-            data = np.loadtxt(filename, skiprows=lines_to_skip)
-        else:
-            data = np.loadtxt(filename)
+        filename = resolve_output(filename)
+        data = load_cached(filename) if use_cache or is_binary(filename) else None
+        if data is not None:
+            # Vistas sobre el memmap, sin copiar
+            data = data[_stationary_rows(stationary_time, dt) :]
+            return data[:, 0], data[:, 1:]  # tiempo y todas las posiciones
 
-        if np.any(np.isnan(data)) or np.any(np.isinf(data)):
-            print("Error: Data file contains NaN or Inf values")
-            return None, None
+        blocks = list(iter_data(filename, stationary_time=stationary_time, dt=dt, use_cache=False))
+        if not blocks:
+            raise ValueError("Data file is empty")
 
-        return data[:, 0], data[:, 1:]  # tiempo y todas las posiciones
+        t = np.concatenate([t for t, _ in blocks])
+        positions = np.concatenate([positions for _, positions in blocks])
+        return t, positions  # tiempo y todas las posiciones
 
     except Exception as e:
         print(f"Error loading data file {filename}: {e}")
         return None, None
 
 
+@derived("max_amplitudes")
+def compute_max_amplitudes(filename, stationary_time=None, dt=None):
+    """Max |y| over all particles for each time step, computed block by block."""
+    try:
+        t_blocks = []
+        max_blocks = []
+        for t, positions in iter_data(filename, stationary_time=stationary_time, dt=dt):
+            t_blocks.append(t)
+            max_blocks.append(np.max(np.abs(positions), axis=1))
+
+        if not t_blocks:
+            raise ValueError("Data file is empty")
+
+        return np.concatenate(t_blocks), np.concatenate(max_blocks)
+
+    except Exception as e:
+        print(f"Error loading data file {filename}: {e}")
+        return None, None
+
+
+@derived("position_stats")
+def compute_position_stats(filename):
+    """Number of rows and min/max position of an output file, in one streaming pass."""
+    try:
+        n_rows = 0
+        y_min = np.inf
+        y_max = -np.inf
+        for t, positions in iter_data(filename):
+            n_rows += len(t)
+            y_min = min(y_min, np.min(positions))
+            y_max = max(y_max, np.max(positions))
+
+        if n_rows == 0:
+            raise ValueError("Data file is empty")
+
+        return n_rows, y_min, y_max
+
+    except Exception as e:
+        print(f"Error loading data file {filename}: {e}")
+        return None, None, None
+
+
+@profiling.profiled("load_reductions")
+def load_reductions(sim_dir, keys):
+    """Arrays saved by engine.main for a run, or None if the run does not have all of keys."""
+    path = os.path.join(sim_dir, REDUCTIONS_FILE)
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as data:
+        if not all(key in data.files for key in keys):
+            return None
+        return {key: data[key] for key in keys}
+
+
+def load_max_amplitudes(sim_dir):
+    """(t, max |y|) for a coupled run, from its reductions if present or else from output.txt."""
+    reductions = load_reductions(sim_dir, ["max_amplitudes_t", "max_amplitudes"])
+    if reductions is not None:
+        return reductions["max_amplitudes_t"], reductions["max_amplitudes"]
+
+    return compute_max_amplitudes(os.path.join(sim_dir, "output.txt"))
+
+
 def mce(num, ana):
     return np.mean((num - ana) ** 2)
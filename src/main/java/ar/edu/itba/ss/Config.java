@@ -1,29 +1,94 @@
 package ar.edu.itba.ss;
 
+import ar.edu.itba.ss.output.OutputFormat;
+import ar.edu.itba.ss.output.Sampling;
+
 public class Config {
 
     // Simulation parameters
-    public static String OUTPUT_DIR = "results";
+    public static String OUTPUT_DIR;
+    public static OutputFormat OUTPUT_FORMAT;
+
+    // Output sampling: every SAVE_EVERY-th step from SAVE_FROM_T on, and only SAVE_PARTICLES (null = all)
+    public static int SAVE_EVERY;
+    public static double SAVE_FROM_T;
+    public static int[] SAVE_PARTICLES;
+
+    // Also write the energy balance (kinetic, potential, dissipated and drive work) of every saved step
+    public static boolean SAVE_ENERGY;
 
     // Single oscillator parameters
-    public static double SINGLE_M = 70.0;
-    public static double SINGLE_K = 1e4;
-    public static double SINGLE_GAMMA = 100.0;
-    public static double SINGLE_X0 = 1.0;
-    public static double SINGLE_V0 = -SINGLE_X0 * SINGLE_GAMMA / (2 * SINGLE_M);
-    public static double SINGLE_DT = 0.01;
-    public static double SINGLE_T_MAX = 5.0;
+    public static double SINGLE_M;
+    public static double SINGLE_K;
+    public static double SINGLE_GAMMA;
+    public static double SINGLE_X0;
+    public static double SINGLE_V0;
+    public static double SINGLE_DT;
+    public static double SINGLE_T_MAX;
 
     // Coupled oscillators parameters
-    public static int COUPLED_N = 1000;
-    public static double COUPLED_M = 0.00021;
-    public static double COUPLED_K = 102.3;
-    public static double COUPLED_GAMMA = 0.0003;
-    public static double COUPLED_A = 0.01;
-    public static double COUPLED_L0 = 0.001;
-    public static double COUPLED_DT = 1e-4;
-    public static double COUPLED_T_MAX = 20.0;
-    public static double COUPLED_OMEGA = 2.0 * Math.PI;
+    public static int COUPLED_N;
+    public static double COUPLED_M;
+    public static double COUPLED_K;
+    public static double COUPLED_GAMMA;
+    public static double COUPLED_A;
+    public static double COUPLED_L0;
+    public static double COUPLED_DT;
+    public static double COUPLED_T_MAX;
+    public static double COUPLED_OMEGA;
+    public static String COUPLED_INTEGRATOR;
+    public static double COUPLED_TOLERANCE;
+
+    // Early stop: relative agreement of the per-period max |y| (0 = disabled) over STEADY_PERIODS periods
+    public static double STEADY_TOLERANCE;
+    public static int STEADY_PERIODS;
+
+    static {
+        reset();
+    }
+
+    // Restore every parameter to its default value
+    public static void reset() {
+        // Simulation parameters
+        OUTPUT_DIR = "results";
+        OUTPUT_FORMAT = OutputFormat.TEXT;
+
+        // Output sampling
+        SAVE_EVERY = 1;
+        SAVE_FROM_T = 0.0;
+        SAVE_PARTICLES = null;
+        SAVE_ENERGY = false;
+
+        // Single oscillator parameters
+        SINGLE_M = 70.0;
+        SINGLE_K = 1e4;
+        SINGLE_GAMMA = 100.0;
+        SINGLE_X0 = 1.0;
+        SINGLE_V0 = -SINGLE_X0 * SINGLE_GAMMA / (2 * SINGLE_M);
+        SINGLE_DT = 0.01;
+        SINGLE_T_MAX = 5.0;
+
+        // Coupled oscillators parameters
+        COUPLED_N = 1000;
+        COUPLED_M = 0.00021;
+        COUPLED_K = 102.3;
+        COUPLED_GAMMA = 0.0003;
+        COUPLED_A = 0.01;
+        COUPLED_L0 = 0.001;
+        COUPLED_DT = 1e-4;
+        COUPLED_T_MAX = 20.0;
+        COUPLED_OMEGA = 2.0 * Math.PI;
+        COUPLED_INTEGRATOR = "VERLET";
+        COUPLED_TOLERANCE = 1e-9;
+
+        // Early stop
+        STEADY_TOLERANCE = 0.0;
+        STEADY_PERIODS = 10;
+    }
+
+    public static Sampling sampling() {
+        return new Sampling(SAVE_EVERY, SAVE_FROM_T, SAVE_PARTICLES);
+    }
 
     public static void parseArguments(String[] args) {
         for (String arg : args) {
@@ -114,6 +179,80 @@ public class Config {
                     }
                     break;
 
+                case "INTEGRATOR":
+                    switch (value.toUpperCase()) {
+                        case "VERLET", "FAST_VERLET", "BEEMAN", "GEAR5", "ADAPTIVE" -> Config.COUPLED_INTEGRATOR = value.toUpperCase();
+                        default -> System.out.println("Invalid value for integrator: " + value);
+                    }
+                    break;
+
+                case "TOLERANCE":
+                    try {
+                        Config.COUPLED_TOLERANCE = Double.parseDouble(value);
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for tolerance: " + value);
+                    }
+                    break;
+
+                case "STEADY_TOLERANCE":
+                    try {
+                        Config.STEADY_TOLERANCE = Double.parseDouble(value);
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for steadyTolerance: " + value);
+                    }
+                    break;
+
+                case "STEADY_PERIODS":
+                    try {
+                        Config.STEADY_PERIODS = Math.max(1, Integer.parseInt(value));
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for steadyPeriods: " + value);
+                    }
+                    break;
+
+                case "FORMAT":
+                    try {
+                        Config.OUTPUT_FORMAT = OutputFormat.valueOf(value.toUpperCase());
+                    } catch (IllegalArgumentException e) {
+                        System.out.println("Invalid value for format: " + value);
+                    }
+                    break;
+
+                case "SAVE_EVERY":
+                    try {
+                        int saveEvery = Integer.parseInt(value);
+                        if (saveEvery < 1)
+                            throw new NumberFormatException();
+                        Config.SAVE_EVERY = saveEvery;
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for saveEvery: " + value);
+                    }
+                    break;
+
+                case "SAVE_FROM_T":
+                    try {
+                        Config.SAVE_FROM_T = Double.parseDouble(value);
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for saveFromT: " + value);
+                    }
+                    break;
+
+                case "SAVE_PARTICLES":
+                    try {
+                        Config.SAVE_PARTICLES = Sampling.parseParticles(value);
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for saveParticles: " + value);
+                    }
+                    break;
+
+                case "ENERGY":
+                    switch (value.toLowerCase()) {
+                        case "true", "1" -> Config.SAVE_ENERGY = true;
+                        case "false", "0" -> Config.SAVE_ENERGY = false;
+                        default -> System.out.println("Invalid value for energy: " + value);
+                    }
+                    break;
+
                 default:
                     System.out.println("Unknown argument: " + key);
             }
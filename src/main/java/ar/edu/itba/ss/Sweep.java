@@ -0,0 +1,177 @@
+package ar.edu.itba.ss;
+
+import java.io.File;
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.text.SimpleDateFormat;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Date;
+import java.util.List;
+import java.util.Set;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Runs many simulations inside one JVM on a fixed thread pool. Every argument accepted by the
+ * Main classes can be given as a comma separated list of values, and the runs are the grid of
+ * all combinations; RUNS_FILE adds one set of runs per line of KEY=VALUE arguments. Each run
+ * gets its own directory and config.json, exactly like a separate launch of its Main.
+ */
+public class Sweep {
+
+    // Parameters that accept a list of values (SAVE_PARTICLES already uses commas for its own list)
+    private static final Set<String> GRID_KEYS = Set.of("DT", "T_MAX", "M", "K", "GAMMA", "X0", "V0", "OMEGA", "N", "INTEGRATOR", "TOLERANCE");
+
+    public static void main(String[] args) {
+        String type = "coupled";
+        int threads = Runtime.getRuntime().availableProcessors();
+        String runsFile = null;
+        List<String> base = new ArrayList<>();
+
+        for (String arg : args) {
+            String[] parts = arg.split("=", 2);
+            String key = parts[0];
+            String value = parts.length == 2 ? parts[1] : "";
+            switch (key) {
+                case "TYPE":
+                    type = value;
+                    break;
+
+                case "THREADS":
+                    try {
+                        threads = Math.max(1, Integer.parseInt(value));
+                    } catch (NumberFormatException e) {
+                        System.out.println("Invalid value for threads: " + value);
+                    }
+                    break;
+
+                case "RUNS_FILE":
+                    runsFile = value;
+                    break;
+
+                default:
+                    base.add(arg);
+            }
+        }
+
+        if (!type.equals("single") && !type.equals("coupled")) {
+            System.out.println("Invalid value for type: " + type);
+            System.exit(1);
+        }
+
+        // One argument list per line of the runs file, or just the command line ones
+        List<List<String>> lines = new ArrayList<>();
+        if (runsFile == null) {
+            lines.add(base);
+        } else {
+            try {
+                for (String line : Files.readAllLines(Paths.get(runsFile))) {
+                    line = line.strip();
+                    if (line.isEmpty() || line.startsWith("#"))
+                        continue;
+                    List<String> runArgs = new ArrayList<>(base);
+                    runArgs.addAll(Arrays.asList(line.split("\\s+")));
+                    lines.add(runArgs);
+                }
+            } catch (IOException e) {
+                System.out.println("Error reading runs file: " + e.getMessage());
+                System.exit(1);
+            }
+        }
+
+        List<List<String>> combinations = new ArrayList<>();
+        for (List<String> line : lines)
+            expandGrid(line, 0, new ArrayList<>(), combinations);
+
+        // Parse every run here, so the simulations only see their own immutable RunConfig
+        String exercise = type.equals("single") ? "ej1" : "ej2";
+        String timestamp = new SimpleDateFormat("yyyy-MM-dd_HH-mm-ss").format(new Date());
+        List<String> outputDirs = new ArrayList<>();
+        List<Runnable> tasks = new ArrayList<>();
+
+        for (List<String> combination : combinations) {
+            Config.reset();
+            Config.parseArguments(combination.toArray(new String[0]));
+            String outputDir = String.format("%s/%s/%s_%04d", Config.OUTPUT_DIR, exercise, timestamp, outputDirs.size());
+
+            if (type.equals("single")) {
+                ar.edu.itba.ss.single.RunConfig run = ar.edu.itba.ss.single.RunConfig.fromConfig();
+                tasks.add(() -> ar.edu.itba.ss.single.Main.run(run, outputDir));
+            } else {
+                ar.edu.itba.ss.coupled.RunConfig run = ar.edu.itba.ss.coupled.RunConfig.fromConfig();
+                try {
+                    run.sampling().validate(run.n());
+                } catch (IllegalArgumentException e) {
+                    System.out.println("Skipping " + combination + ": " + e.getMessage());
+                    continue;
+                }
+                tasks.add(() -> ar.edu.itba.ss.coupled.Main.run(run, outputDir));
+            }
+            outputDirs.add(outputDir);
+        }
+
+        runAll(tasks, outputDirs, threads);
+    }
+
+    // Cartesian product of the values of every GRID_KEYS argument given as a list
+    private static void expandGrid(List<String> args, int index, List<String> current, List<List<String>> out) {
+        if (index == args.size()) {
+            out.add(new ArrayList<>(current));
+            return;
+        }
+
+        String arg = args.get(index);
+        String[] parts = arg.split("=", 2);
+        String[] values = parts.length == 2 && GRID_KEYS.contains(parts[0]) ? parts[1].split(",") : null;
+        if (values == null) {
+            current.add(arg);
+            expandGrid(args, index + 1, current, out);
+            current.remove(current.size() - 1);
+            return;
+        }
+
+        for (String value : values) {
+            current.add(parts[0] + "=" + value.strip());
+            expandGrid(args, index + 1, current, out);
+            current.remove(current.size() - 1);
+        }
+    }
+
+    private static void runAll(List<Runnable> tasks, List<String> outputDirs, int threads) {
+        int total = tasks.size();
+        AtomicInteger done = new AtomicInteger();
+        ExecutorService pool = Executors.newFixedThreadPool(Math.min(threads, Math.max(total, 1)));
+        List<Future<?>> futures = new ArrayList<>();
+
+        for (int i = 0; i < total; i++) {
+            Runnable task = tasks.get(i);
+            String outputDir = outputDirs.get(i);
+            futures.add(pool.submit(() -> {
+                File file = new File(outputDir);
+                if (!file.exists() && !file.mkdirs())
+                    throw new IllegalStateException("Error creating output directory: " + outputDir);
+                task.run();
+                System.out.printf("[%d/%d] %s%n", done.incrementAndGet(), total, outputDir);
+            }));
+        }
+        pool.shutdown();
+
+        for (int i = 0; i < total; i++) {
+            try {
+                futures.get(i).get();
+            } catch (ExecutionException e) {
+                System.out.println("Warning: Run " + outputDirs.get(i) + " failed: " + e.getCause().getMessage());
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
+                pool.shutdownNow();
+                return;
+            }
+        }
+    }
+
+}
@@ -0,0 +1,64 @@
+package ar.edu.itba.ss.coupled;
+
+/**
+ * Energy balance of the driven chain, updated once per step. Kinetic and spring potential energy
+ * (including the springs to the driven end and to the wall) come from the current state; the
+ * energy dissipated by damping, integral of sum(gamma * v_i^2), and the work done by the drive,
+ * integral of k * (y_{-1} - y_0) * dy_{-1}/dt, are accumulated with the trapezoidal rule. Without
+ * integration error kinetic + potential - work + dissipated stays at its initial value.
+ */
+public class EnergyAccumulator {
+
+    public static final String[] COLUMNS = {"t", "kinetic", "potential", "dissipated", "work"};
+
+    private final Oscillator osc;
+    private final double[] row = new double[COLUMNS.length - 1];
+
+    private boolean started = false;
+    private double lastT, lastDissipation, lastDrivePower;
+    private double dissipated = 0.0, work = 0.0;
+
+    public EnergyAccumulator(Oscillator osc) {
+        this.osc = osc;
+    }
+
+    // Advance the integrals to time t with the current state; returns (kinetic, potential, dissipated, work)
+    public double[] update(double t) {
+        double[] y = osc.positionsView();
+        double[] v = osc.velocitiesView();
+        int n = osc.getN();
+        double k = osc.getK();
+        double drive = osc.drive(t);
+
+        // Sum of v_i^2, shared by the kinetic energy and the damping power, and of the squared elongations
+        double squaredSpeeds = 0.0, springs = 0.0;
+        double previous = drive;
+        for (int i = 0; i < n; i++) {
+            squaredSpeeds += v[i] * v[i];
+            double elongation = y[i] - previous;
+            springs += elongation * elongation;
+            previous = y[i];
+        }
+        springs += previous * previous;
+
+        double dissipation = osc.getGamma() * squaredSpeeds;
+        double drivePower = k * (drive - y[0]) * osc.driveDerivative(t, 1);
+
+        if (started) {
+            double half = 0.5 * (t - lastT);
+            dissipated += half * (lastDissipation + dissipation);
+            work += half * (lastDrivePower + drivePower);
+        }
+        started = true;
+        lastT = t;
+        lastDissipation = dissipation;
+        lastDrivePower = drivePower;
+
+        row[0] = 0.5 * osc.getM() * squaredSpeeds;
+        row[1] = 0.5 * k * springs;
+        row[2] = dissipated;
+        row[3] = work;
+        return row;
+    }
+
+}
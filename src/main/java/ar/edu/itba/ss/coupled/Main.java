@@ -1,6 +1,11 @@
 package ar.edu.itba.ss.coupled;
 
 import ar.edu.itba.ss.Config;
+import ar.edu.itba.ss.coupled.integrators.AdaptiveIntegrator;
+import ar.edu.itba.ss.coupled.integrators.BeemanIntegrator;
+import ar.edu.itba.ss.coupled.integrators.FastVerletIntegrator;
+import ar.edu.itba.ss.coupled.integrators.Gear5Integrator;
+import ar.edu.itba.ss.coupled.integrators.Integrator;
 import ar.edu.itba.ss.coupled.integrators.VerletIntegrator;
 
 import java.io.BufferedWriter;
@@ -14,16 +19,14 @@ public class Main {
 
     public static void main(String[] args) {
         Config.parseArguments(args);
+        RunConfig run = RunConfig.fromConfig();
 
-        int n = Config.COUPLED_N;
-        double m = Config.COUPLED_M;
-        double k = Config.COUPLED_K;
-        double gamma = Config.COUPLED_GAMMA;
-        double a = Config.COUPLED_A;
-        double omega = Config.COUPLED_OMEGA;
-
-        double dt = Config.COUPLED_DT;
-        double tMax = Config.COUPLED_T_MAX;
+        try {
+            run.sampling().validate(run.n());
+        } catch (IllegalArgumentException e) {
+            System.out.println("Invalid value for saveParticles: " + e.getMessage());
+            System.exit(1);
+        }
 
         String timestamp = new SimpleDateFormat("yyyy-MM-dd_HH-mm-ss").format(new Date());
         String outputDir = String.format("%s/ej2/%s", Config.OUTPUT_DIR, timestamp);
@@ -35,28 +38,68 @@ public class Main {
             System.exit(1);
         }
 
-        saveConfig(outputDir, dt, tMax, k, omega);
+        run(run, outputDir);
+    }
+
+    // Simulate one run into outputDir; only uses run, so it is safe to call from several threads
+    public static void run(RunConfig run, String outputDir) {
+        saveConfig(outputDir, run, -1, null);
+
+        String fileName = String.format("%s/output%s", outputDir, run.format().getExtension());
+        Oscillator osc = new Oscillator(run.n(), run.m(), run.k(), run.gamma(), run.a(), run.omega());
+        Integrator integrator = createIntegrator(run.integrator(), run.tolerance());
+        Simulation simulation = new Simulation(osc, run.dt(), run.tMax(), integrator, fileName, run.format(), run.sampling());
+
+        SteadyStateDetector steadyState = null;
+        if (run.steadyTolerance() > 0) {
+            steadyState = new SteadyStateDetector(run.omega(), run.steadyTolerance(), run.steadyPeriods());
+            simulation.setSteadyStateDetector(steadyState);
+        }
+        if (run.energy())
+            simulation.setEnergyFile(String.format("%s/energy%s", outputDir, run.format().getExtension()));
+        simulation.run();
+
+        // Record the cost of the run to compare integrators against their error, and the steady state
+        saveConfig(outputDir, run, osc.getEvaluations(), steadyState);
+    }
 
-        String fileName = String.format("%s/output.txt", outputDir);
-        Oscillator osc = new Oscillator(n, m, k, gamma, a, omega);
-        new Simulation(osc, dt, tMax, new VerletIntegrator(), fileName).run();
+    public static Integrator createIntegrator(String name, double tolerance) {
+        return switch (name) {
+            case "FAST_VERLET" -> new FastVerletIntegrator();
+            case "BEEMAN" -> new BeemanIntegrator();
+            case "GEAR5" -> new Gear5Integrator();
+            case "ADAPTIVE" -> new AdaptiveIntegrator(tolerance);
+            default -> new VerletIntegrator();
+        };
     }
 
-    private static void saveConfig(String outputDir, double dt, double tMax, double k, double omega) {
+    // evaluations < 0 means the run has not finished yet
+    private static void saveConfig(String outputDir, RunConfig run, long evaluations, SteadyStateDetector steadyState) {
         try (BufferedWriter writer = new BufferedWriter(new FileWriter(outputDir + "/config.json"))) {
             writer.write("{\n");
             writer.write("  \"oscillatorType\": \"coupled\",\n");
             writer.write("  \"simulation\": {\n");
-            writer.write("    \"dt\": " + dt + ",\n");
-            writer.write("    \"tMax\": " + tMax + "\n");
+            writer.write("    \"dt\": " + run.dt() + ",\n");
+            writer.write("    \"tMax\": " + run.tMax() + ",\n");
+            writer.write("    \"integrator\": \"" + run.integrator() + "\",\n");
+            if (run.integrator().equals("ADAPTIVE"))
+                writer.write("    \"tolerance\": " + run.tolerance() + ",\n");
+            if (evaluations >= 0)
+                writer.write("    \"forceEvaluations\": " + evaluations + ",\n");
+            writer.write("    \"sampleDt\": " + run.dt() * run.sampling().getSaveEvery() + "\n");
             writer.write("  },\n");
+            writer.write("  \"output\": " + run.sampling().toJson() + ",\n");
+            if (steadyState != null && steadyState.isReached()) {
+                writer.write("  \"steadyState\": {\"time\": " + steadyState.getTime()
+                        + ", \"amplitude\": " + steadyState.getAmplitude() + "},\n");
+            }
             writer.write("  \"parameters\": {\n");
-            writer.write("    \"N\": " + Config.COUPLED_N + ",\n");
-            writer.write("    \"m\": " + Config.COUPLED_M + ",\n");
-            writer.write("    \"k\": " + k + ",\n");
-            writer.write("    \"gamma\": " + Config.COUPLED_GAMMA + ",\n");
-            writer.write("    \"A\": " + Config.COUPLED_A + ",\n");
-            writer.write("    \"omega\": " + omega + "\n");
+            writer.write("    \"N\": " + run.n() + ",\n");
+            writer.write("    \"m\": " + run.m() + ",\n");
+            writer.write("    \"k\": " + run.k() + ",\n");
+            writer.write("    \"gamma\": " + run.gamma() + ",\n");
+            writer.write("    \"A\": " + run.a() + ",\n");
+            writer.write("    \"omega\": " + run.omega() + "\n");
             writer.write("  }\n");
             writer.write("}\n");
         } catch (IOException e) {
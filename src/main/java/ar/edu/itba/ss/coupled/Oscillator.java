@@ -5,6 +5,7 @@ public class Oscillator {
     private final int N;
     private final double m, k, gamma, A, omega;
     private double[] positions, velocities, accelerations;
+    private long evaluations;
 
     public Oscillator(int N, double m, double k, double gamma, double A, double omega) {
         this.N = N;
@@ -24,23 +25,32 @@ public class Oscillator {
             positions[i] = 0.0;
             velocities[i] = 0.0;
         }
+        evaluations = 0;
+
         // Compute initial accelerations based on t=0
         computeAccelerations(0.0);
     }
 
     public void computeAccelerations(double t) {
+        evaluate(positions, velocities, A * Math.sin(omega * t), accelerations);
+    }
+
+    // out = (F(y, dy) with the driven end at yDriven) / m; with the positions and velocities it gives
+    // the accelerations, and with their derivatives the higher derivatives used by Gear
+    public void evaluate(double[] y, double[] dy, double yDriven, double[] out) {
+        evaluations++;
         for (int i = 0; i < N; i++) {
-            double yi = positions[i];
-            double vi = velocities[i];
-            
+            double yi = y[i];
+            double vi = dy[i];
+
             // For i=N-1 (last particle), yi+1 is fixed at 0
             // For i=0 (first particle), yi-1 is the forcing function A*sin(ωt)
-            double yiMinus = (i == 0) ? A * Math.sin(omega * t) : positions[i - 1];
-            double yiPlus = (i == N - 1) ? 0.0 : positions[i + 1];
-            
+            double yiMinus = (i == 0) ? yDriven : y[i - 1];
+            double yiPlus = (i == N - 1) ? 0.0 : y[i + 1];
+
             // Fi = -k(yi-yi-1) - k(yi-yi+1) - γvi
             double force = -k * (yi - yiMinus) - k * (yi - yiPlus) - gamma * vi;
-            accelerations[i] = force / m;
+            out[i] = force / m;
         }
     }
 
@@ -65,4 +75,60 @@ public class Oscillator {
         return N;
     }
 
+    public double getM() {
+        return m;
+    }
+
+    public double getK() {
+        return k;
+    }
+
+    public double getGamma() {
+        return gamma;
+    }
+
+    // Position of the driven end, y_{-1}(t)
+    public double drive(double t) {
+        return A * Math.sin(omega * t);
+    }
+
+    // order-th time derivative of the driven end
+    public double driveDerivative(double t, int order) {
+        double scale = A * Math.pow(omega, order);
+        return switch (order % 4) {
+            case 0 -> scale * Math.sin(omega * t);
+            case 1 -> scale * Math.cos(omega * t);
+            case 2 -> -scale * Math.sin(omega * t);
+            default -> -scale * Math.cos(omega * t);
+        };
+    }
+
+    // Number of force evaluations over the whole chain, the cost measure of the integrators
+    public long getEvaluations() {
+        return evaluations;
+    }
+
+    public void addEvaluations(long count) {
+        evaluations += count;
+    }
+
+    // Direct references to the state, for integrators that update it in place
+    public double[] positionsView() {
+        return positions;
+    }
+
+    public double[] velocitiesView() {
+        return velocities;
+    }
+
+    public double[] accelerationsView() {
+        return accelerations;
+    }
+
+    // Takes ownership of the arrays without copying them
+    public void swapState(double[] newPos, double[] newVel) {
+        this.positions = newPos;
+        this.velocities = newVel;
+    }
+
 }
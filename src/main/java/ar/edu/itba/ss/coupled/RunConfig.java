@@ -0,0 +1,22 @@
+package ar.edu.itba.ss.coupled;
+
+import ar.edu.itba.ss.Config;
+import ar.edu.itba.ss.output.OutputFormat;
+import ar.edu.itba.ss.output.Sampling;
+
+/**
+ * Immutable parameters of one coupled run, so several runs can be simulated concurrently
+ * without sharing the static Config fields.
+ */
+public record RunConfig(int n, double m, double k, double gamma, double a, double omega,
+                        double dt, double tMax, String integrator, double tolerance, double steadyTolerance, int steadyPeriods,
+                        OutputFormat format, Sampling sampling, boolean energy) {
+
+    public static RunConfig fromConfig() {
+        return new RunConfig(Config.COUPLED_N, Config.COUPLED_M, Config.COUPLED_K, Config.COUPLED_GAMMA,
+                Config.COUPLED_A, Config.COUPLED_OMEGA, Config.COUPLED_DT, Config.COUPLED_T_MAX,
+                Config.COUPLED_INTEGRATOR, Config.COUPLED_TOLERANCE, Config.STEADY_TOLERANCE, Config.STEADY_PERIODS,
+                Config.OUTPUT_FORMAT, Config.sampling(), Config.SAVE_ENERGY);
+    }
+
+}
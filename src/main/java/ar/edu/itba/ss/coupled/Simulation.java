@@ -1,14 +1,14 @@
 package ar.edu.itba.ss.coupled;
 
 import ar.edu.itba.ss.coupled.integrators.Integrator;
+import ar.edu.itba.ss.output.OutputFormat;
+import ar.edu.itba.ss.output.RowWriter;
+import ar.edu.itba.ss.output.Sampling;
 
-import java.io.FileWriter;
 import java.io.IOException;
-import java.io.PrintWriter;
 import java.nio.file.Files;
 import java.nio.file.Path;
 import java.nio.file.Paths;
-import java.util.Locale;
 
 public class Simulation {
 
@@ -16,13 +16,47 @@ public class Simulation {
     private final double dt, tMax;
     private final Integrator integrator;
     private final String outputFile;
+    private final OutputFormat format;
+    private final Sampling sampling;
+    private SteadyStateDetector steadyState;
+    private String energyFile;
 
     public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile) {
+        this(osc, dt, tMax, integrator, outputFile, OutputFormat.TEXT, Sampling.ALL);
+    }
+
+    public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile, OutputFormat format) {
+        this(osc, dt, tMax, integrator, outputFile, format, Sampling.ALL);
+    }
+
+    public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile,
+                      OutputFormat format, Sampling sampling) {
+        sampling.validate(osc.getN());
         this.osc = osc;
         this.dt = dt;
         this.tMax = tMax;
         this.integrator = integrator;
         this.outputFile = outputFile;
+        this.format = format;
+        this.sampling = sampling;
+    }
+
+    // Stop the run as soon as the detector reports a steady state
+    public void setSteadyStateDetector(SteadyStateDetector steadyState) {
+        this.steadyState = steadyState;
+    }
+
+    // Also write the energy balance of every saved step to energyFile
+    public void setEnergyFile(String energyFile) {
+        this.energyFile = energyFile;
+    }
+
+    private static String[] columns(int[] particles) {
+        String[] columns = new String[particles.length + 1];
+        columns[0] = "t";
+        for (int i = 0; i < particles.length; i++)
+            columns[i + 1] = "y" + particles[i];
+        return columns;
     }
 
     public void run() {
@@ -31,22 +65,35 @@ public class Simulation {
             Path outputPath = Paths.get(outputFile);
             Files.createDirectories(outputPath.getParent());
 
-            try (PrintWriter writer = new PrintWriter(new FileWriter(outputFile))) {
+            int[] particles = sampling.indices(osc.getN());
+            double sampleDt = dt * sampling.getSaveEvery();
+            try (RowWriter writer = format.open(outputFile, sampleDt, osc.getN(), columns(particles));
+                 RowWriter energyWriter = energyFile == null ? null
+                         : format.open(energyFile, sampleDt, osc.getN(), EnergyAccumulator.COLUMNS)) {
                 osc.initialize();
                 integrator.initialize(osc, dt);
+                EnergyAccumulator energy = energyWriter == null ? null : new EnergyAccumulator(osc);
+                double[] saved = new double[particles.length];
                 double t = 0.0;
+                long step = 0;
 
                 while (t <= tMax) {
-                    double[] pos = osc.getPositions();
+                    // The energy integrals advance every step, even the ones that are not saved
+                    double[] energies = energy == null ? null : energy.update(t);
 
-                    // Save time and all particle positions
-                    writer.printf(Locale.US, "%s", t);
-                    for (double po : pos)
-                        writer.printf(Locale.US, "\t%s", po);
-                    writer.println();
+                    // Save time and the sampled particle positions
+                    if (sampling.shouldSave(step, t)) {
+                        writer.writeRow(t, sampling.select(osc.positionsView(), saved));
+                        if (energyWriter != null)
+                            energyWriter.writeRow(t, energies);
+                    }
 
                     integrator.step(osc, t, dt);
                     t += dt;
+                    step++;
+
+                    if (steadyState != null && steadyState.update(t, osc.positionsView()))
+                        break;
                 }
             }
         } catch (IOException e) {
@@ -0,0 +1,66 @@
+package ar.edu.itba.ss.coupled;
+
+/**
+ * Tracks the max |y| over the chain in every period of the drive and reports a steady state once
+ * the maxima of the last periods + 1 periods all agree within a relative tolerance. Comparing a
+ * whole window, instead of only consecutive periods, avoids stopping at the flat top of a slow
+ * beat of the transient.
+ */
+public class SteadyStateDetector {
+
+    private final double period, tolerance;
+    private final double[] maxima;
+
+    private long currentPeriod = 0;
+    private double currentMax = 0.0;
+    private int completed = 0;
+    private double amplitude = Double.NaN, time = Double.NaN;
+
+    public SteadyStateDetector(double omega, double tolerance, int periods) {
+        this.period = 2 * Math.PI / omega;
+        this.tolerance = tolerance;
+        this.maxima = new double[periods + 1];
+    }
+
+    // Returns true once the steady state is reached
+    public boolean update(double t, double[] positions) {
+        long index = (long) Math.floor(t / period);
+        if (index != currentPeriod) {
+            // A period just ended, keep its maximum in the window
+            maxima[completed % maxima.length] = currentMax;
+            completed++;
+            currentMax = 0.0;
+            currentPeriod = index;
+
+            if (completed >= maxima.length) {
+                double min = Double.POSITIVE_INFINITY, max = 0.0;
+                for (double value : maxima) {
+                    min = Math.min(min, value);
+                    max = Math.max(max, value);
+                }
+                if (max > 0 && max - min <= tolerance * max) {
+                    amplitude = max;
+                    time = t;
+                    return true;
+                }
+            }
+        }
+
+        for (double y : positions)
+            currentMax = Math.max(currentMax, Math.abs(y));
+        return false;
+    }
+
+    public boolean isReached() {
+        return !Double.isNaN(amplitude);
+    }
+
+    public double getAmplitude() {
+        return amplitude;
+    }
+
+    public double getTime() {
+        return time;
+    }
+
+}
@@ -0,0 +1,128 @@
+package ar.edu.itba.ss.coupled.integrators;
+
+import ar.edu.itba.ss.coupled.Oscillator;
+
+/**
+ * Embedded Dormand-Prince 5(4) Runge-Kutta with step size control. Each call to step advances
+ * exactly dt, which becomes the output sampling interval, taking as many internal steps as the
+ * tolerance requires; the last internal step is shortened to land on t + dt.
+ */
+public class AdaptiveIntegrator implements Integrator {
+
+    private static final double[] C = {0, 1.0 / 5, 3.0 / 10, 4.0 / 5, 8.0 / 9, 1, 1};
+    private static final double[][] A = {
+            {},
+            {1.0 / 5},
+            {3.0 / 40, 9.0 / 40},
+            {44.0 / 45, -56.0 / 15, 32.0 / 9},
+            {19372.0 / 6561, -25360.0 / 2187, 64448.0 / 6561, -212.0 / 729},
+            {9017.0 / 3168, -355.0 / 33, 46732.0 / 5247, 49.0 / 176, -5103.0 / 18656},
+            {35.0 / 384, 0, 500.0 / 1113, 125.0 / 192, -2187.0 / 6784, 11.0 / 84},
+    };
+    // Difference between the 5th and 4th order weights, the local error estimate
+    private static final double[] E = {71.0 / 57600, 0, -71.0 / 16695, 71.0 / 1920, -17253.0 / 339200, 22.0 / 525, -1.0 / 40};
+
+    private static final double SAFETY = 0.9, MIN_FACTOR = 0.2, MAX_FACTOR = 5.0;
+    private static final double MIN_STEP_FRACTION = 1e-12;
+
+    private final double tolerance;
+    private double h;
+    private double[][] ky, kv;  // Stage derivatives of positions (velocities) and velocities (accelerations)
+    private double[] yStage, vStage;
+
+    public AdaptiveIntegrator(double tolerance) {
+        this.tolerance = tolerance;
+    }
+
+    @Override
+    public void initialize(Oscillator osc, double dt) {
+        int N = osc.getN();
+        h = dt;
+        ky = new double[7][N];
+        kv = new double[7][N];
+        yStage = new double[N];
+        vStage = new double[N];
+
+        // First stage of the first step (FSAL: later ones reuse the last stage of the previous step)
+        System.arraycopy(osc.velocitiesView(), 0, ky[0], 0, N);
+        System.arraycopy(osc.accelerationsView(), 0, kv[0], 0, N);
+    }
+
+    @Override
+    public void step(Oscillator osc, double t, double dt) {
+        double end = t + dt;
+        double time = t;
+
+        while (time < end) {
+            boolean last = time + h >= end;
+            double step = last ? end - time : h;
+            double error = attempt(osc, time, step);
+
+            // Scale the step with the error, within limits
+            double factor = error == 0 ? MAX_FACTOR : Math.min(MAX_FACTOR, Math.max(MIN_FACTOR, SAFETY * Math.pow(error, -0.2)));
+            if (error <= 1) {
+                accept(osc);
+                time = last ? end : time + step;
+                // A shortened last step does not shrink the following ones
+                h = last ? Math.max(h, step * factor) : step * factor;
+            } else {
+                h = step * factor;
+                if (h < MIN_STEP_FRACTION * dt)
+                    throw new IllegalStateException("Step size underflow at t=" + time);
+            }
+        }
+
+        // Leave the oscillator accelerations consistent with its state
+        System.arraycopy(kv[0], 0, osc.accelerationsView(), 0, osc.getN());
+    }
+
+    // Compute the stages of a step of size step from time, returning the scaled error norm
+    private double attempt(Oscillator osc, double time, double step) {
+        int N = osc.getN();
+        double[] y = osc.positionsView();
+        double[] v = osc.velocitiesView();
+
+        for (int s = 1; s < 7; s++) {
+            for (int i = 0; i < N; i++) {
+                double dy = 0, dv = 0;
+                for (int j = 0; j < s; j++) {
+                    dy += A[s][j] * ky[j][i];
+                    dv += A[s][j] * kv[j][i];
+                }
+                yStage[i] = y[i] + step * dy;
+                vStage[i] = v[i] + step * dv;
+            }
+            System.arraycopy(vStage, 0, ky[s], 0, N);
+            osc.evaluate(yStage, vStage, osc.drive(time + C[s] * step), kv[s]);
+        }
+
+        // The last stage is evaluated at the 5th order solution, now in yStage and vStage
+        double error = 0;
+        for (int i = 0; i < N; i++) {
+            double ey = 0, ev = 0;
+            for (int s = 0; s < 7; s++) {
+                ey += E[s] * ky[s][i];
+                ev += E[s] * kv[s][i];
+            }
+            double scaleY = tolerance * (1 + Math.max(Math.abs(y[i]), Math.abs(yStage[i])));
+            double scaleV = tolerance * (1 + Math.max(Math.abs(v[i]), Math.abs(vStage[i])));
+            error = Math.max(error, Math.max(Math.abs(step * ey) / scaleY, Math.abs(step * ev) / scaleV));
+        }
+        return error;
+    }
+
+    private void accept(Oscillator osc) {
+        int N = osc.getN();
+        System.arraycopy(yStage, 0, osc.positionsView(), 0, N);
+        System.arraycopy(vStage, 0, osc.velocitiesView(), 0, N);
+
+        // FSAL: the last stage is the first of the next step
+        double[] tmp = ky[0];
+        ky[0] = ky[6];
+        ky[6] = tmp;
+        tmp = kv[0];
+        kv[0] = kv[6];
+        kv[6] = tmp;
+    }
+
+}
@@ -0,0 +1,49 @@
+package ar.edu.itba.ss.coupled.integrators;
+
+import ar.edu.itba.ss.coupled.Oscillator;
+
+public class BeemanIntegrator implements Integrator {
+
+    private double[] prevAccelerations, accelerations, velocities;
+
+    @Override
+    public void initialize(Oscillator osc, double dt) {
+        int N = osc.getN();
+        prevAccelerations = osc.getAccelerations();
+        accelerations = new double[N];
+        velocities = new double[N];
+    }
+
+    @Override
+    public void step(Oscillator osc, double t, double dt) {
+        int N = osc.getN();
+        double[] x = osc.positionsView();
+        double[] v = osc.velocitiesView();
+        double[] aNext = osc.accelerationsView();
+        double[] a = accelerations;
+        double[] aPrev = prevAccelerations;
+
+        // Keep a(t) and v(t), the oscillator state is updated in place
+        System.arraycopy(aNext, 0, a, 0, N);
+        System.arraycopy(v, 0, velocities, 0, N);
+
+        for (int i = 0; i < N; i++) {
+            x[i] = x[i] + velocities[i] * dt + (2.0 / 3.0 * a[i] - 1.0 / 6.0 * aPrev[i]) * dt * dt;
+
+            // Predecir velocidad para estimar aNext
+            v[i] = velocities[i] + (3.0 / 2.0 * a[i] - 1.0 / 2.0 * aPrev[i]) * dt;
+        }
+        osc.computeAccelerations(t + dt);
+
+        for (int i = 0; i < N; i++) {
+            v[i] = velocities[i] + (1.0 / 3.0 * aNext[i] + 5.0 / 6.0 * a[i] - 1.0 / 6.0 * aPrev[i]) * dt;
+        }
+
+        // Accelerations with the corrected velocities (the damping depends on them)
+        osc.computeAccelerations(t + dt);
+
+        prevAccelerations = a;
+        accelerations = aPrev;
+    }
+
+}
@@ -0,0 +1,73 @@
+package ar.edu.itba.ss.coupled.integrators;
+
+import ar.edu.itba.ss.coupled.Oscillator;
+
+/**
+ * Allocation-free version of VerletIntegrator: the position buffers are rotated by reference,
+ * the oscillator state is updated in place and positions, velocities and accelerations are
+ * computed in a single pass. The arithmetic is the same as VerletIntegrator, operation by
+ * operation, so both produce bit-for-bit identical trajectories.
+ */
+public class FastVerletIntegrator implements Integrator {
+
+    private double[] prevPositions, nextPositions, nextVelocities;
+
+    @Override
+    public void initialize(Oscillator osc, double dt) {
+        int N = osc.getN();
+        double[] x = osc.positionsView();
+        double[] v = osc.velocitiesView();
+        double[] a = osc.accelerationsView();
+        prevPositions = new double[N];
+        nextPositions = new double[N];
+        nextVelocities = new double[N];
+        for (int i = 0; i < N; i++) {
+            prevPositions[i] = x[i] - v[i] * dt + 0.5 * a[i] * dt * dt;
+        }
+    }
+
+    @Override
+    public void step(Oscillator osc, double t, double dt) {
+        int N = osc.getN();
+        double k = osc.getK();
+        double m = osc.getM();
+        double gamma = osc.getGamma();
+        double[] x = osc.positionsView();
+        double[] a = osc.accelerationsView();
+        double[] next = nextPositions;
+        double[] prev = prevPositions;
+        double[] vel = nextVelocities;
+
+        // The driven end is evaluated once per step
+        double yiMinus = osc.drive(t + dt);
+        next[0] = 2 * x[0] - prev[0] + a[0] * dt * dt;
+
+        for (int i = 0; i < N; i++) {
+            // Advance the next particle first, so its new position is ready for the force on i
+            double yiPlus = 0.0;
+            if (i + 1 < N) {
+                next[i + 1] = 2 * x[i + 1] - prev[i + 1] + a[i + 1] * dt * dt;
+                yiPlus = next[i + 1];
+            }
+
+            double yi = next[i];
+            double vi = (yi - prev[i]) / (2 * dt);
+            vel[i] = vi;
+
+            // a[i] is no longer needed by any position update, so it is overwritten in place
+            double force = -k * (yi - yiMinus) - k * (yi - yiPlus) - gamma * vi;
+            a[i] = force / m;
+            yiMinus = yi;
+        }
+
+        osc.addEvaluations(1);
+
+        // Rotate the buffers: current becomes previous, the old previous is reused for the next step
+        double[] oldVelocities = osc.velocitiesView();
+        osc.swapState(next, vel);
+        nextPositions = prev;
+        nextVelocities = oldVelocities;
+        prevPositions = x;
+    }
+
+}
@@ -0,0 +1,76 @@
+package ar.edu.itba.ss.coupled.integrators;
+
+import ar.edu.itba.ss.coupled.Oscillator;
+
+public class Gear5Integrator implements Integrator {
+
+    // Correction coefficients for a second order equation
+    private static final double[] ALPHA = {3.0 / 16, 251.0 / 360, 1.0, 11.0 / 18, 1.0 / 6, 1.0 / 60};
+    private static final double[] FACTORIAL = {1, 1, 2, 6, 24, 120};
+
+    private double[][] r;  // r0 to r5, one value per particle
+    private final double[] factors = new double[6];  // ALPHA[q] * q! / dt^q, for factorsDt
+    private double factorsDt = Double.NaN;
+
+    @Override
+    public void initialize(Oscillator osc, double dt) {
+        int N = osc.getN();
+        r = new double[6][];
+        r[0] = osc.getPositions();
+        r[1] = osc.getVelocities();
+        r[2] = osc.getAccelerations();
+
+        // The equations are linear, so each derivative of the acceleration is the same force
+        // applied to the next derivatives, with the matching derivative of the driven end
+        for (int q = 3; q <= 5; q++) {
+            r[q] = new double[N];
+            osc.evaluate(r[q - 2], r[q - 1], osc.driveDerivative(0.0, q - 2), r[q]);
+        }
+        computeFactors(dt);
+    }
+
+    private void computeFactors(double dt) {
+        for (int q = 0; q <= 5; q++)
+            factors[q] = ALPHA[q] * FACTORIAL[q] / Math.pow(dt, q);
+        factorsDt = dt;
+    }
+
+    @Override
+    public void step(Oscillator osc, double t, double dt) {
+        int N = osc.getN();
+        double dt1 = dt, dt2 = dt * dt / 2, dt3 = dt * dt * dt / 6, dt4 = dt * dt * dt * dt / 24, dt5 = dt * dt * dt * dt * dt / 120;
+
+        // Predict, in place (each row only uses the higher, not yet updated, ones)
+        for (int i = 0; i < N; i++) {
+            r[0][i] = r[0][i] + dt1 * r[1][i] + dt2 * r[2][i] + dt3 * r[3][i] + dt4 * r[4][i] + dt5 * r[5][i];
+            r[1][i] = r[1][i] + dt1 * r[2][i] + dt2 * r[3][i] + dt3 * r[4][i] + dt4 * r[5][i];
+            r[2][i] = r[2][i] + dt1 * r[3][i] + dt2 * r[4][i] + dt3 * r[5][i];
+            r[3][i] = r[3][i] + dt1 * r[4][i] + dt2 * r[5][i];
+            r[4][i] = r[4][i] + dt1 * r[5][i];
+        }
+
+        // Evaluate the acceleration at the predicted state
+        double[] x = osc.positionsView();
+        double[] v = osc.velocitiesView();
+        double[] a = osc.accelerationsView();
+        System.arraycopy(r[0], 0, x, 0, N);
+        System.arraycopy(r[1], 0, v, 0, N);
+        osc.computeAccelerations(t + dt);
+
+        // Correct, with the factors of the initial dt unless it changed
+        if (dt != factorsDt)
+            computeFactors(dt);
+
+        for (int i = 0; i < N; i++) {
+            double deltaR2 = (a[i] - r[2][i]) * dt * dt / 2;
+            for (int q = 0; q <= 5; q++) {
+                r[q][i] += factors[q] * deltaR2;
+            }
+        }
+
+        System.arraycopy(r[0], 0, x, 0, N);
+        System.arraycopy(r[1], 0, v, 0, N);
+        System.arraycopy(r[2], 0, a, 0, N);
+    }
+
+}
@@ -0,0 +1,93 @@
+package ar.edu.itba.ss.output;
+
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Paths;
+import java.nio.file.StandardOpenOption;
+import java.util.Locale;
+
+/**
+ * Writes rows as little-endian float64 or float32 values after a self-describing header:
+ * the magic "TP4B", an int32 version, an int32 length and a JSON object with dtype, dt, N and
+ * column names, padded with spaces so the data starts at a multiple of 64 bytes.
+ */
+public class BinaryRowWriter implements RowWriter {
+
+    public static final byte[] MAGIC = "TP4B".getBytes(StandardCharsets.US_ASCII);
+    public static final int VERSION = 1;
+
+    private static final int ALIGNMENT = 64;
+    private static final int BUFFER_SIZE = 1 << 20;
+
+    private final FileChannel channel;
+    private final ByteBuffer buffer;
+    private final boolean float32;
+    private final int rowBytes;
+
+    public BinaryRowWriter(String outputFile, double dt, int n, String[] columns, boolean float32) throws IOException {
+        this.channel = FileChannel.open(Paths.get(outputFile),
+                StandardOpenOption.CREATE, StandardOpenOption.WRITE, StandardOpenOption.TRUNCATE_EXISTING);
+        this.float32 = float32;
+        this.rowBytes = columns.length * (float32 ? Float.BYTES : Double.BYTES);
+        this.buffer = ByteBuffer.allocateDirect(Math.max(BUFFER_SIZE, rowBytes)).order(ByteOrder.LITTLE_ENDIAN);
+        writeHeader(dt, n, columns);
+    }
+
+    private void writeHeader(double dt, int n, String[] columns) throws IOException {
+        StringBuilder json = new StringBuilder();
+        json.append(String.format(Locale.US, "{\"dtype\": \"%s\", \"dt\": %s, \"N\": %d, \"columns\": [",
+                float32 ? "<f4" : "<f8", dt, n));
+        for (int i = 0; i < columns.length; i++) {
+            json.append(i == 0 ? "\"" : ", \"").append(columns[i]).append('"');
+        }
+        json.append("]}");
+
+        // Pad the header with spaces so the rows start aligned
+        int prefix = MAGIC.length + 2 * Integer.BYTES;
+        int length = json.length();
+        int padded = ((prefix + length + ALIGNMENT - 1) / ALIGNMENT) * ALIGNMENT - prefix;
+        json.append(" ".repeat(padded - length));
+
+        byte[] bytes = json.toString().getBytes(StandardCharsets.US_ASCII);
+        ByteBuffer header = ByteBuffer.allocate(prefix + bytes.length).order(ByteOrder.LITTLE_ENDIAN);
+        header.put(MAGIC).putInt(VERSION).putInt(bytes.length).put(bytes).flip();
+        while (header.hasRemaining())
+            channel.write(header);
+    }
+
+    @Override
+    public void writeRow(double t, double[] values) throws IOException {
+        if (buffer.remaining() < rowBytes)
+            flush();
+
+        if (float32) {
+            buffer.putFloat((float) t);
+            for (double value : values)
+                buffer.putFloat((float) value);
+        } else {
+            buffer.putDouble(t);
+            for (double value : values)
+                buffer.putDouble(value);
+        }
+    }
+
+    private void flush() throws IOException {
+        buffer.flip();
+        while (buffer.hasRemaining())
+            channel.write(buffer);
+        buffer.clear();
+    }
+
+    @Override
+    public void close() throws IOException {
+        try {
+            flush();
+        } finally {
+            channel.close();
+        }
+    }
+
+}
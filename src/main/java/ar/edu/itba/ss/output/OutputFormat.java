@@ -0,0 +1,29 @@
+package ar.edu.itba.ss.output;
+
+import java.io.IOException;
+
+public enum OutputFormat {
+
+    TEXT(".txt"),
+    FLOAT64(".bin"),
+    FLOAT32(".bin");
+
+    private final String extension;
+
+    OutputFormat(String extension) {
+        this.extension = extension;
+    }
+
+    public String getExtension() {
+        return extension;
+    }
+
+    public RowWriter open(String outputFile, double dt, int n, String[] columns) throws IOException {
+        return switch (this) {
+            case TEXT -> new TextRowWriter(outputFile);
+            case FLOAT64 -> new BinaryRowWriter(outputFile, dt, n, columns, false);
+            case FLOAT32 -> new BinaryRowWriter(outputFile, dt, n, columns, true);
+        };
+    }
+
+}
@@ -0,0 +1,10 @@
+package ar.edu.itba.ss.output;
+
+import java.io.Closeable;
+import java.io.IOException;
+
+public interface RowWriter extends Closeable {
+
+    void writeRow(double t, double[] values) throws IOException;
+
+}
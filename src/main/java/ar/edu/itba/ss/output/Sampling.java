@@ -0,0 +1,105 @@
+package ar.edu.itba.ss.output;
+
+/**
+ * Which steps and particles a simulation writes: every saveEvery-th step with t >= saveFromT,
+ * and only the given particle indices (all of them when particles is null).
+ */
+public class Sampling {
+
+    public static final Sampling ALL = new Sampling(1, 0.0, null);
+
+    private final int saveEvery;
+    private final double saveFromT;
+    private final int[] particles;
+
+    public Sampling(int saveEvery, double saveFromT, int[] particles) {
+        if (saveEvery < 1)
+            throw new IllegalArgumentException("saveEvery must be at least 1");
+        this.saveEvery = saveEvery;
+        this.saveFromT = saveFromT;
+        this.particles = particles == null ? null : particles.clone();
+    }
+
+    public boolean shouldSave(long step, double t) {
+        return t >= saveFromT && step % saveEvery == 0;
+    }
+
+    public int getSaveEvery() {
+        return saveEvery;
+    }
+
+    public double getSaveFromT() {
+        return saveFromT;
+    }
+
+    public int[] getParticles() {
+        return particles == null ? null : particles.clone();
+    }
+
+    public void validate(int n) {
+        if (particles == null)
+            return;
+        for (int i : particles) {
+            if (i < 0 || i >= n)
+                throw new IllegalArgumentException("Particle index out of range: " + i);
+        }
+    }
+
+    // Indices of the saved values among the n available ones
+    public int[] indices(int n) {
+        if (particles != null)
+            return particles.clone();
+        int[] all = new int[n];
+        for (int i = 0; i < n; i++)
+            all[i] = i;
+        return all;
+    }
+
+    // Saved subset of values, written into out (of length indices(n).length) unless all are saved
+    public double[] select(double[] values, double[] out) {
+        if (particles == null)
+            return values;
+        for (int i = 0; i < particles.length; i++)
+            out[i] = values[particles[i]];
+        return out;
+    }
+
+    // JSON object saved under "output" in config.json
+    public String toJson() {
+        StringBuilder json = new StringBuilder();
+        json.append("{\"saveEvery\": ").append(saveEvery).append(", \"saveFromT\": ").append(saveFromT);
+        if (particles != null) {
+            json.append(", \"particles\": [");
+            for (int i = 0; i < particles.length; i++)
+                json.append(i == 0 ? "" : ", ").append(particles[i]);
+            json.append("]");
+        }
+        return json.append("}").toString();
+    }
+
+    public static int[] parseParticles(String value) {
+        // Either a range start:end[:step] (end excluded) or a comma separated list
+        if (value.contains(":")) {
+            String[] parts = value.split(":");
+            if (parts.length < 2 || parts.length > 3)
+                throw new NumberFormatException("Invalid range: " + value);
+            int start = Integer.parseInt(parts[0]);
+            int end = Integer.parseInt(parts[1]);
+            int step = parts.length == 3 ? Integer.parseInt(parts[2]) : 1;
+            if (step < 1 || end < start)
+                throw new NumberFormatException("Invalid range: " + value);
+
+            int[] particles = new int[(end - start + step - 1) / step];
+            for (int i = 0; i < particles.length; i++)
+                particles[i] = start + i * step;
+            return particles;
+        }
+
+        String[] parts = value.split(",");
+        int[] particles = new int[parts.length];
+        for (int i = 0; i < parts.length; i++)
+            particles[i] = Integer.parseInt(parts[i].trim());
+        return particles;
+    }
+
+}
@@ -0,0 +1,30 @@
+package ar.edu.itba.ss.output;
+
+import java.io.FileWriter;
+import java.io.IOException;
+import java.io.PrintWriter;
+import java.util.Locale;
+
+public class TextRowWriter implements RowWriter {
+
+    private final PrintWriter writer;
+
+    public TextRowWriter(String outputFile) throws IOException {
+        this.writer = new PrintWriter(new FileWriter(outputFile));
+    }
+
+    @Override
+    public void writeRow(double t, double[] values) {
+        // Tab separated time and values, one row per line
+        writer.printf(Locale.US, "%s", t);
+        for (double value : values)
+            writer.printf(Locale.US, "\t%s", value);
+        writer.println();
+    }
+
+    @Override
+    public void close() {
+        writer.close();
+    }
+
+}
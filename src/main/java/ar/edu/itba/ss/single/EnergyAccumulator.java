@@ -0,0 +1,39 @@
+package ar.edu.itba.ss.single;
+
+/**
+ * Energy balance of the damped oscillator, updated once per step: kinetic and spring potential
+ * energy of the current state, and the energy dissipated by damping, integral of gamma * v^2,
+ * accumulated with the trapezoidal rule. Without integration error kinetic + potential +
+ * dissipated stays at its initial value.
+ */
+public class EnergyAccumulator {
+
+    public static final String[] COLUMNS = {"t", "kinetic", "potential", "dissipated"};
+
+    private final Oscillator osc;
+    private final double[] row = new double[COLUMNS.length - 1];
+
+    private boolean started = false;
+    private double lastT, lastDissipation;
+    private double dissipated = 0.0;
+
+    public EnergyAccumulator(Oscillator osc) {
+        this.osc = osc;
+    }
+
+    // Advance the integral to time t with the state (x, v); returns (kinetic, potential, dissipated)
+    public double[] update(double t, double x, double v) {
+        double dissipation = osc.gamma * v * v;
+        if (started)
+            dissipated += 0.5 * (t - lastT) * (lastDissipation + dissipation);
+        started = true;
+        lastT = t;
+        lastDissipation = dissipation;
+
+        row[0] = 0.5 * osc.m * v * v;
+        row[1] = 0.5 * osc.k * x * x;
+        row[2] = dissipated;
+        return row;
+    }
+
+}
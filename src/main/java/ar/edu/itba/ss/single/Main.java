@@ -16,14 +16,7 @@ public class Main {
 
     public static void main(String[] args) {
         Config.parseArguments(args);
-
-        double dt = Config.SINGLE_DT;
-        double tMax = Config.SINGLE_T_MAX;
-        double m = Config.SINGLE_M;
-        double k = Config.SINGLE_K;
-        double gamma = Config.SINGLE_GAMMA;
-        double x0 = Config.SINGLE_X0;
-        double v0 = Config.SINGLE_V0;
+        RunConfig run = RunConfig.fromConfig();
 
         String timestamp = new SimpleDateFormat("yyyy-MM-dd_HH-mm-ss").format(new Date());
         String outputDir = String.format("%s/ej1/%s", Config.OUTPUT_DIR, timestamp);
@@ -35,29 +28,45 @@ public class Main {
             System.exit(1);
         }
 
-        saveConfig(outputDir, dt, tMax);
+        run(run, outputDir);
+    }
+
+    // Simulate one run into outputDir; only uses run, so it is safe to call from several threads
+    public static void run(RunConfig run, String outputDir) {
+        saveConfig(outputDir, run);
+
+        Oscillator osc = new Oscillator(run.m(), run.k(), run.gamma(), run.x0(), run.v0());
+        double dt = run.dt();
+        double tMax = run.tMax();
+        String ext = run.format().getExtension();
+        simulate(run, outputDir, "verlet", new Simulation(osc, dt, tMax, new VerletIntegrator(), String.format("%s/output_verlet%s", outputDir, ext), run.format(), run.sampling()));
+        simulate(run, outputDir, "beeman", new Simulation(osc, dt, tMax, new BeemanIntegrator(), String.format("%s/output_beeman%s", outputDir, ext), run.format(), run.sampling()));
+        simulate(run, outputDir, "gear", new Simulation(osc, dt, tMax, new Gear5Integrator(), String.format("%s/output_gear%s", outputDir, ext), run.format(), run.sampling()));
+    }
 
-        Oscillator osc = new Oscillator(m, k, gamma, x0, v0);
-        new Simulation(osc, dt, tMax, new VerletIntegrator(), String.format("%s/output_verlet.txt", outputDir)).run();
-        new Simulation(osc, dt, tMax, new BeemanIntegrator(), String.format("%s/output_beeman.txt", outputDir)).run();
-        new Simulation(osc, dt, tMax, new Gear5Integrator(), String.format("%s/output_gear.txt", outputDir)).run();
+    // The energy of each integrator goes next to its output, as energy_<name>
+    private static void simulate(RunConfig run, String outputDir, String name, Simulation simulation) {
+        if (run.energy())
+            simulation.setEnergyFile(String.format("%s/energy_%s%s", outputDir, name, run.format().getExtension()));
+        simulation.run();
     }
 
-    public static void saveConfig(String outputDir, double dt, double tMax) {
+    public static void saveConfig(String outputDir, RunConfig run) {
         String fileName = String.format("%s/config.json", outputDir);
         try (BufferedWriter writer = new BufferedWriter(new FileWriter(fileName))) {
             writer.write("{\n");
             writer.write("  \"oscillatorType\": \"single\",\n");
             writer.write("  \"simulation\": {\n");
-            writer.write("    \"dt\": " + dt + ",\n");
-            writer.write("    \"tMax\": " + tMax + "\n");
+            writer.write("    \"dt\": " + run.dt() + ",\n");
+            writer.write("    \"tMax\": " + run.tMax() + "\n");
             writer.write("  },\n");
+            writer.write("  \"output\": " + run.sampling().toJson() + ",\n");
             writer.write("  \"parameters\": {\n");
-            writer.write("    \"m\": " + Config.SINGLE_M + ",\n");
-            writer.write("    \"k\": " + Config.SINGLE_K + ",\n");
-            writer.write("    \"gamma\": " + Config.SINGLE_GAMMA + ",\n");
-            writer.write("    \"x0\": " + Config.SINGLE_X0 + ",\n");
-            writer.write("    \"v0\": " + Config.SINGLE_V0 + "\n");
+            writer.write("    \"m\": " + run.m() + ",\n");
+            writer.write("    \"k\": " + run.k() + ",\n");
+            writer.write("    \"gamma\": " + run.gamma() + ",\n");
+            writer.write("    \"x0\": " + run.x0() + ",\n");
+            writer.write("    \"v0\": " + run.v0() + "\n");
             writer.write("  }\n");
             writer.write("}\n");
         } catch (IOException e) {
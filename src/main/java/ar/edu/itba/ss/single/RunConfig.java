@@ -0,0 +1,20 @@
+package ar.edu.itba.ss.single;
+
+import ar.edu.itba.ss.Config;
+import ar.edu.itba.ss.output.OutputFormat;
+import ar.edu.itba.ss.output.Sampling;
+
+/**
+ * Immutable parameters of one single oscillator run, so several runs can be simulated
+ * concurrently without sharing the static Config fields.
+ */
+public record RunConfig(double m, double k, double gamma, double x0, double v0,
+                        double dt, double tMax, OutputFormat format, Sampling sampling, boolean energy) {
+
+    public static RunConfig fromConfig() {
+        return new RunConfig(Config.SINGLE_M, Config.SINGLE_K, Config.SINGLE_GAMMA, Config.SINGLE_X0,
+                Config.SINGLE_V0, Config.SINGLE_DT, Config.SINGLE_T_MAX, Config.OUTPUT_FORMAT, Config.sampling(),
+                Config.SAVE_ENERGY);
+    }
+
+}
@@ -1,41 +1,81 @@
 package ar.edu.itba.ss.single;
 
+import ar.edu.itba.ss.output.OutputFormat;
+import ar.edu.itba.ss.output.RowWriter;
+import ar.edu.itba.ss.output.Sampling;
 import ar.edu.itba.ss.single.integrators.Integrator;
 
 import java.io.*;
-import java.util.Locale;
 
 public class Simulation {
 
+    private static final String[] COLUMNS = {"t", "x", "v", "analytical"};
+
     private final Oscillator osc;
     private final double dt, tMax;
     private final Integrator integrator;
     private final String outputFile;
+    private final OutputFormat format;
+    private final Sampling sampling;
+    private String energyFile;
 
     public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile) {
+        this(osc, dt, tMax, integrator, outputFile, OutputFormat.TEXT, Sampling.ALL);
+    }
+
+    public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile, OutputFormat format) {
+        this(osc, dt, tMax, integrator, outputFile, format, Sampling.ALL);
+    }
+
+    // Only the step stride and start time of the sampling apply to a single oscillator
+    public Simulation(Oscillator osc, double dt, double tMax, Integrator integrator, String outputFile,
+                      OutputFormat format, Sampling sampling) {
         this.osc = osc;
         this.dt = dt;
         this.tMax = tMax;
         this.integrator = integrator;
         this.outputFile = outputFile;
+        this.format = format;
+        this.sampling = sampling;
+    }
+
+    // Also write the energy balance of every saved step to energyFile
+    public void setEnergyFile(String energyFile) {
+        this.energyFile = energyFile;
     }
 
     public void run() {
         try {
-            try (PrintWriter writer = new PrintWriter(new FileWriter(outputFile))) {
+            double sampleDt = dt * sampling.getSaveEvery();
+            try (RowWriter writer = format.open(outputFile, sampleDt, 1, COLUMNS);
+                 RowWriter energyWriter = energyFile == null ? null
+                         : format.open(energyFile, sampleDt, 1, EnergyAccumulator.COLUMNS)) {
                 double x = osc.x0;
                 double v = osc.v0;
                 double t = 0.0;
+                long step = 0;
+                double[] row = new double[3];
+                EnergyAccumulator energy = energyWriter == null ? null : new EnergyAccumulator(osc);
 
                 integrator.initialize(osc, x, v, dt);
 
                 while (t <= tMax) {
-                    double analytical = osc.analytical(t);
-                    writer.printf(Locale.US, "%s\t%s\t%s\t%s%n", t, x, v, analytical);
+                    // The energy integral advances every step, even the ones that are not saved
+                    double[] energies = energy == null ? null : energy.update(t, x, v);
+
+                    if (sampling.shouldSave(step, t)) {
+                        row[0] = x;
+                        row[1] = v;
+                        row[2] = osc.analytical(t);
+                        writer.writeRow(t, row);
+                        if (energyWriter != null)
+                            energyWriter.writeRow(t, energies);
+                    }
                     double[] next = integrator.step(x, v, t);
                     x = next[0];
                     v = next[1];
                     t += dt;
+                    step++;
                 }
             }
         } catch (IOException e) {
@@ -45,4 +85,3 @@ public class Simulation {
     }
 
 }
-